@@ -1,31 +1,58 @@
 import pandas as pd
 import numpy as np
-from statsmodels.regression.linear_model import OLS
-from statsmodels.tools.tools import add_constant
+
+HAR_COLUMNS = ["const", "RV_d", "RV_w", "RV_m"]
 
 def compute_realized_volatility(returns: pd.Series, window: int = 22):
-    return (returns ** 2).rolling(window).sum()
+    r2 = np.square(returns.to_numpy(dtype=np.float64))
+    missing = np.isnan(r2)
+
+    # Rolling sum as a difference of prefix sums; windows that touch a NaN
+    # (or are not yet full) stay NaN, as with rolling(window).sum().
+    cs = np.zeros(len(r2) + 1)
+    np.cumsum(np.where(missing, 0.0, r2), out=cs[1:])
+    cn = np.zeros(len(r2) + 1, dtype=np.int64)
+    np.cumsum(missing, out=cn[1:])
+
+    rv = np.full(len(r2), np.nan)
+    full = cn[window:] - cn[:-window] == 0
+    rv[window - 1 :] = np.where(full, cs[window:] - cs[:-window], np.nan)
+    return pd.Series(rv, index=returns.index, name=returns.name)
 
 def fit_har_rv(returns: pd.Series):
     """
     Fit HAR-RV model using past daily, weekly, and monthly realized volatilities.
     """
-    rv = compute_realized_volatility(returns, window=1)
-    data = pd.DataFrame({
-        "RV": rv,
-        "RV_d": rv.shift(1),
-        "RV_w": rv.rolling(5).mean().shift(1),
-        "RV_m": rv.rolling(22).mean().shift(1),
-    }).dropna()
-
-    X = add_constant(data[["RV_d", "RV_w", "RV_m"]])
-    y = data["RV"]
-    model = OLS(y, X).fit()
-
-    data["RV_pred"] = model.predict(X)
+    r2 = returns.to_numpy(dtype=np.float64) ** 2
+    missing = np.isnan(r2)
+
+    # Prefix sums give every weekly/monthly mean as a difference of two entries;
+    # a parallel count of missing values drops rows whose windows touch a NaN.
+    cs = np.concatenate(([0.0], np.cumsum(np.where(missing, 0.0, r2))))
+    cn = np.concatenate(([0], np.cumsum(missing)))
+
+    t = np.arange(22, len(r2))
+    t = t[cn[t + 1] - cn[t - 22] == 0]
+
+    X = np.column_stack([
+        np.ones(len(t)),
+        r2[t - 1],
+        (cs[t] - cs[t - 5]) / 5,
+        (cs[t] - cs[t - 22]) / 22,
+    ])
+    y = r2[t]
+
+    # Plain least squares: only beta, fitted values and R² are needed, so skip
+    # the statsmodels wrapper and its covariance/inference machinery.
+    beta, _, _, _ = np.linalg.lstsq(X, y, rcond=None)
+    fitted = X @ beta
+    resid = y - fitted
+    r2_score = 1 - (resid @ resid) / ((y - y.mean()) ** 2).sum()
+
+    index = returns.index[t]
     return {
-        "coefficients": model.params.to_dict(),
-        "fitted": data["RV_pred"],
-        "residuals": model.resid,
-        "r2": model.rsquared
+        "coefficients": dict(zip(HAR_COLUMNS, beta.tolist())),
+        "fitted": pd.Series(fitted, index=index, name="RV_pred"),
+        "residuals": pd.Series(resid, index=index),
+        "r2": float(r2_score)
     }
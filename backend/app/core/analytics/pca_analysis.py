@@ -2,6 +2,7 @@ from app.services.data_pipeline import get_sector_data
 from app.core.db_utils import save_pca_snapshot
 import pandas as pd
 import numpy as np
+import scipy.linalg
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,49 +13,80 @@ async def compute_rolling_pca(window=60, n_components=None, force_refresh=False)
     
     if n_components is None:
         n_components = len(sector_tickers)
+    n_components = min(n_components, len(sector_tickers))
     
     logger.info(f"PCA: {len(sector_tickers)} sectors, using {n_components} components")
 
-    evr_list, score_list, loadings_list = [], [], []
-    idx = rets.index
+    values = rets.to_numpy(dtype=np.float64)
 
-    for t in range(window - 1, len(idx)):
-        X = rets.iloc[t - window + 1 : t + 1]
-        X = X - X.mean()
-        C = np.corrcoef(X.T)
+    # Rolling covariance from prefix sums of x and x x^T: each window is the
+    # difference of two cumulative sums instead of a fresh pass over its rows.
+    # Centering on the full-sample mean first keeps the differences well conditioned.
+    X = values - values.mean(axis=0)
+    n_obs, n_assets = X.shape
+    S1 = np.zeros((n_obs + 1, n_assets))
+    S2 = np.zeros((n_obs + 1, n_assets, n_assets))
+    np.cumsum(X, axis=0, out=S1[1:])
+    np.cumsum(np.matmul(X[:, :, None], X[:, None, :]), axis=0, out=S2[1:])
+
+    sum_x = S1[window:] - S1[:-window]
+    sum_xx = S2[window:] - S2[:-window]
+    cov = (sum_xx - np.matmul(sum_x[:, :, None], sum_x[:, None, :]) / window) / (window - 1)
+    sd = np.sqrt(np.diagonal(cov, axis1=1, axis2=2))
+    C = cov / (sd[:, :, None] * sd[:, None, :])
+
+    if n_components < n_assets // 2:
+        # Only a few leading components wanted: extract just those per window
+        # (O(K^2 k) instead of a full O(K^3) spectrum). diag(C) == 1, so the
+        # total variance is K and the EVRs of the top k need no other eigenvalues.
+        top = [n_assets - n_components, n_assets - 1]
+        vals = np.empty((len(C), n_components))
+        vecs = np.empty((len(C), n_assets, n_components))
+        for t, C_t in enumerate(C):
+            vals[t], vecs[t] = scipy.linalg.eigh(C_t, subset_by_index=top, check_finite=False)
+        vals, vecs = vals[:, ::-1], vecs[..., ::-1]
+        total_var = n_assets
+    else:
+        # Batched eigh: one LAPACK dispatch for all days. eigh already returns
+        # eigenvalues in ascending order, so a reversed view gives descending
+        # order without an argsort or a copy.
         vals, vecs = np.linalg.eigh(C)
-        order = vals.argsort()[::-1]
-        vals, vecs = vals[order], vecs[:, order]
-        if "XLK" in sector_tickers and vecs[sector_tickers.index("XLK"), 0] < 0:
-            vecs[:, 0] *= -1
+        vals, vecs = vals[..., ::-1], vecs[..., ::-1]
+        total_var = vals.sum(axis=1, keepdims=True)
+    if "XLK" in sector_tickers:
+        flip = np.where(vecs[:, sector_tickers.index("XLK"), 0] < 0, -1.0, 1.0)
+        vecs[:, :, 0] *= flip[:, None]
 
-        evr_list.append(vals / vals.sum())
-        loadings_list.append(vecs)
-        score_list.append(vecs.T @ rets.iloc[t].values)
+    # Scores and loadings are only projected onto the leading components
+    # requested; the full path still reports EVRs for the whole spectrum.
+    evr_values = vals / total_var
+    components = vecs[..., :n_components]
+    score_values = np.einsum('tkc,tk->tc', components, values[window - 1 :])
+    loadings_list = list(components)
 
-    dates = idx[window - 1 :]
+    dates = rets.index[window - 1 :]
     
-    actual_components = len(sector_tickers)
+    actual_components = evr_values.shape[1]
     
     evr = pd.DataFrame(
-        evr_list, 
+        evr_values, 
         index=dates, 
         columns=[f"EVR{k}" for k in range(1, actual_components + 1)]
     )
     scores = pd.DataFrame(
-        score_list, 
+        score_values, 
         index=dates, 
-        columns=[f"PC{k}_score" for k in range(1, actual_components + 1)]
+        columns=[f"PC{k}_score" for k in range(1, n_components + 1)]
     )
 
     pca_signal = (scores["PC1_score"] - scores["PC1_score"].mean()) / scores["PC1_score"].std()
     pca_signal = pca_signal.rolling(20).mean()
 
-    await save_pca_snapshot(evr, scores, loadings_list, window, actual_components, sector_tickers)
+    await save_pca_snapshot(evr, scores, loadings_list, window, n_components, sector_tickers)
 
     return {
         "explained_variance": evr,
         "scores": scores,
         "signal": pca_signal,
         "loadings": loadings_list
-    }
\ No newline at end of file
+    }
@@ -1,9 +1,10 @@
 import io
 import base64
+import asyncio
 import numpy as np
 import pandas as pd
-import statsmodels.api as sm
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from statsmodels.regression.quantile_regression import QuantReg
 from app.core.db_utils import save_quantile_results
 
@@ -30,27 +31,46 @@ async def compute_quantile_regression(all_data_for_reg: pd.DataFrame, generate_p
     y = all_data_for_reg["HYG"]
     X = all_data_for_reg.drop(columns=["HYG"])
 
-    # Interaction terms
-    X["Corr_VIX_Interaction"] = X["HYG_SPY_Corr"] * X["VIX_Change"]
-    X["Corr_Spread_Interaction"] = X["HYG_SPY_Corr"] * X["HY_Spread_Change"]
-    X["Vol_Corr_Interaction"] = X["SPY_Vol"] * X["HYG_SPY_Corr"]
-    X = sm.add_constant(X)
-
     quantiles = [0.01, 0.05, 0.10, 0.25, 0.50, 0.75, 0.90, 0.95, 0.99]
     results = {}
 
-    for q in quantiles:
-        model = QuantReg(y, X)
-        fit = model.fit(q=q)
-        ssr = np.sum((y - fit.fittedvalues) ** 2)
-        sst = np.sum((y - y.mean()) ** 2)
-        r2 = 1 - (ssr / sst)
-
+    # Assemble [const | predictors | interaction terms] straight into one
+    # Fortran-ordered buffer (the layout LAPACK expects), so neither the
+    # interaction columns nor the constant go through pandas block inserts.
+    hc = X["HYG_SPY_Corr"].to_numpy(dtype=np.float64)
+    vx = X["VIX_Change"].to_numpy(dtype=np.float64)
+    hs = X["HY_Spread_Change"].to_numpy(dtype=np.float64)
+    sv = X["SPY_Vol"].to_numpy(dtype=np.float64)
+
+    n_base = X.shape[1]
+    columns = ["const", *X.columns, "Corr_VIX_Interaction", "Corr_Spread_Interaction", "Vol_Corr_Interaction"]
+    X_np = np.empty((len(X), len(columns)), dtype=np.float64, order="F")
+    X_np[:, 0] = 1.0
+    X_np[:, 1 : n_base + 1] = X.to_numpy(dtype=np.float64)
+    np.multiply(hc, vx, out=X_np[:, n_base + 1])
+    np.multiply(hc, hs, out=X_np[:, n_base + 2])
+    np.multiply(sv, hc, out=X_np[:, n_base + 3])
+    y_np = np.ascontiguousarray(y.to_numpy(dtype=np.float64))
+
+    # X is the same for every quantile: build the model (and its exog setup)
+    # once and only re-run the IRLS fit per q. sst doesn't depend on q either.
+    model = QuantReg(y_np, X_np)
+    fits = {q: model.fit(q=q) for q in quantiles}
+    y_mean = y_np.mean()
+    sst = ((y_np - y_mean) ** 2).sum()
+
+    # Parameter matrix (one row per quantile) for the plots
+    coefs = np.empty((len(quantiles), len(columns)), dtype=np.float64)
+
+    for i, (q, fit) in enumerate(fits.items()):
+        coefs[i] = fit.params
+        fitted = fit.fittedvalues
+        ssr = ((y_np - fitted) ** 2).sum()
         results[q] = {
-            "params": fit.params.to_dict(),
-            "pvalues": fit.pvalues.to_dict(),
-            "r2": float(r2),
-            "fitted": fit.fittedvalues,
+            "params": dict(zip(columns, fit.params.tolist())),
+            "pvalues": dict(zip(columns, fit.pvalues.tolist())),
+            "r2": float(1 - (ssr / sst)),
+            "fitted": pd.Series(fitted, index=y.index),
         }
 
     # Summaries for reporting
@@ -82,41 +102,46 @@ async def compute_quantile_regression(all_data_for_reg: pd.DataFrame, generate_p
 
     await save_quantile_results(summaries, results)
 
-    # Optional plotting (convert to base64 for frontend)
+    # Optional plotting (convert to base64 for frontend), rendered in a worker thread
     if generate_plots:
-        figs_base64 = []
-        fig, axes = plt.subplots(2, 2, figsize=(12, 8))
-
-        # Plot 1: coefficients across quantiles
-        coef_df = pd.DataFrame({q: pd.Series(results[q]["params"]) for q in quantiles}).T
-        coef_df.plot(ax=axes[0, 0], title="Coefficient Dynamics Across Quantiles")
-        axes[0, 0].grid(True, alpha=0.3)
-
-        # Plot 2: pseudo R²
-        r2s = [results[q]["r2"] for q in quantiles]
-        axes[0, 1].plot(quantiles, r2s, marker="o")
-        axes[0, 1].set_title("Pseudo R² Across Quantiles")
-        axes[0, 1].grid(True, alpha=0.3)
-
-        # Plot 3: fitted quantiles vs actual
-        for q in [0.05, 0.5, 0.95]:
-            axes[1, 0].scatter(y, results[q]["fitted"], s=8, alpha=0.3, label=f"{q*100:.0f}th")
-        axes[1, 0].legend()
-        axes[1, 0].set_title("Actual vs Fitted Quantile Predictions")
-        axes[1, 0].grid(True, alpha=0.3)
-
-        # Plot 4: tail amplification
-        tail_ampl = pd.Series(results[0.05]["params"]) / pd.Series(results[0.50]["params"])
-        tail_ampl.dropna().plot(kind="bar", ax=axes[1, 1], color="crimson", title="Tail Amplification (5th / 50th)")
-        axes[1, 1].grid(True, alpha=0.3)
-
-        plt.tight_layout()
-        buf = io.BytesIO()
-        plt.savefig(buf, format="png", bbox_inches="tight")
-        buf.seek(0)
-        figs_base64.append(base64.b64encode(buf.read()).decode("utf-8"))
-        plt.close(fig)
-
-        output["plots"] = figs_base64
+        output["plots"] = await asyncio.to_thread(_render_plots, results, quantiles, coefs, columns, y)
 
     return output
+
+
+def _render_plots(results: dict, quantiles: list, coefs: np.ndarray, columns: list, y: pd.Series) -> list:
+    """Render the quantile regression diagnostics to base64 PNGs (no pyplot state)."""
+    fig = Figure(figsize=(12, 8))
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(2, 2)
+
+    # Plot 1: coefficients across quantiles
+    coef_df = pd.DataFrame(coefs, index=quantiles, columns=columns)
+    coef_df.plot(ax=axes[0, 0], title="Coefficient Dynamics Across Quantiles")
+    axes[0, 0].grid(True, alpha=0.3)
+
+    # Plot 2: pseudo R²
+    r2s = [results[q]["r2"] for q in quantiles]
+    axes[0, 1].plot(quantiles, r2s, marker="o")
+    axes[0, 1].set_title("Pseudo R² Across Quantiles")
+    axes[0, 1].grid(True, alpha=0.3)
+
+    # Plot 3: fitted quantiles vs actual
+    for q in [0.05, 0.5, 0.95]:
+        axes[1, 0].scatter(y, results[q]["fitted"], s=8, alpha=0.3, label=f"{q*100:.0f}th")
+    axes[1, 0].legend()
+    axes[1, 0].set_title("Actual vs Fitted Quantile Predictions")
+    axes[1, 0].grid(True, alpha=0.3)
+
+    # Plot 4: tail amplification
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = coefs[quantiles.index(0.05)] / coefs[quantiles.index(0.50)]
+    tail_ampl = pd.Series(ratio, index=columns)
+    tail_ampl.dropna().plot(kind="bar", ax=axes[1, 1], color="crimson", title="Tail Amplification (5th / 50th)")
+    axes[1, 1].grid(True, alpha=0.3)
+
+    fig.tight_layout()
+    buf = io.BytesIO()
+    # savefig goes through the Agg canvas attached above; keeps bbox_inches="tight"
+    fig.savefig(buf, format="png", bbox_inches="tight")
+    return [base64.b64encode(buf.getvalue()).decode("utf-8")]
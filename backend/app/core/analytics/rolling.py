@@ -0,0 +1,104 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Fixed-window rolling statistics on plain float arrays, matching pandas'
+# rolling(window) defaults: the first window - 1 entries and any window that
+# touches a NaN come back as NaN. Sums are taken as differences of prefix
+# sums, so each statistic is one pass over the data.
+
+
+def _valid_windows(columns, window: int):
+    """Rows with a NaN in any column, and the mask of windows free of them."""
+    n = len(columns[0])
+    missing = np.zeros(n, dtype=bool)
+    for col in columns:
+        missing |= np.isnan(col)
+
+    cn = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(missing, out=cn[1:])
+    return missing, cn[window:] - cn[:-window] == 0
+
+
+def _window_sums(columns, window: int):
+    """Per-window sums of each column, plus a mask of windows free of NaNs."""
+    n = len(columns[0])
+    missing, valid = _valid_windows(columns, window)
+
+    sums = []
+    cs = np.zeros(n + 1)
+    for col in columns:
+        np.cumsum(np.where(missing, 0.0, col), out=cs[1:])
+        sums.append(cs[window:] - cs[:-window])
+    return sums, valid
+
+
+def _centered(x: np.ndarray) -> np.ndarray:
+    # Centering first keeps the prefix sums small and the differences exact
+    mean = np.nanmean(x) if np.isfinite(x).any() else 0.0
+    return x - mean
+
+
+def _pad(values: np.ndarray, n: int) -> np.ndarray:
+    out = np.full(n, np.nan)
+    out[n - len(values):] = values
+    return out
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    if n < window:
+        return np.full(n, np.nan)
+
+    center = np.nanmean(x) if np.isfinite(x).any() else 0.0
+    (sx,), valid = _window_sums([x - center], window)
+    return _pad(np.where(valid, sx / window + center, np.nan), n)
+
+
+def rolling_std(x: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    if window <= ddof or n < window:
+        return np.full(n, np.nan)
+
+    xc = _centered(x)
+    (sx, sxx), valid = _window_sums([xc, xc * xc], window)
+    var = np.maximum(sxx - sx * sx / window, 0.0) / (window - ddof)
+    return _pad(np.where(valid, np.sqrt(var), np.nan), n)
+
+
+def rolling_corr(x: np.ndarray, y: np.ndarray, window: int) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n < window:
+        return np.full(n, np.nan)
+
+    xc, yc = _centered(x), _centered(y)
+    (sx, sy, sxx, syy, sxy), valid = _window_sums([xc, yc, xc * xc, yc * yc, xc * yc], window)
+    cov = sxy - sx * sy / window
+    var_x = sxx - sx * sx / window
+    var_y = syy - sy * sy / window
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov / np.sqrt(var_x * var_y)
+    valid &= (var_x > 0) & (var_y > 0)
+    return _pad(np.where(valid, np.clip(corr, -1.0, 1.0), np.nan), n)
+
+
+def rolling_quantile(x: np.ndarray, window: int, q: float) -> np.ndarray:
+    """Linear-interpolated rolling quantile via partial sort of each window."""
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    if n < window:
+        return np.full(n, np.nan)
+
+    h = q * (window - 1)
+    lo = int(np.floor(h))
+    hi = min(lo + 1, window - 1)
+    # Only the two order statistics around h are needed, so partition
+    # (O(window)) instead of sorting each window
+    part = np.partition(sliding_window_view(x, window), [lo, hi], axis=-1)
+    values = part[:, lo] + (h - lo) * (part[:, hi] - part[:, lo])
+
+    _, valid = _valid_windows([x], window)
+    return _pad(np.where(valid, values, np.nan), n)
@@ -1,37 +1,69 @@
 import redis.asyncio as redis
+import asyncio
 import os
 import pickle
+import struct
+import time
 import logging
+import weakref
+from collections import OrderedDict
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+# Every cached payload lives under this prefix so it can be cleared without
+# touching other keys (refresh leases, health probes, other apps on the server)
+CACHE_PREFIX = "app:"
 
 class RedisCache:
     _instance: Optional[redis.Redis] = None
+    _pool: Optional[redis.ConnectionPool] = None
+    _lock = asyncio.Lock()
     
     @classmethod
     async def get_client(cls) -> Optional[redis.Redis]:
         if cls._instance is None:
-            await cls._initialize()
+            # Double-checked so a startup stampede opens a single pool
+            async with cls._lock:
+                if cls._instance is None:
+                    await cls._initialize()
         return cls._instance
     
     @classmethod
     async def _initialize(cls):
+        pool = None
         try:
-            cls._instance = await redis.from_url(REDIS_URL, decode_responses=False)
-            await cls._instance.ping()
+            # Bounded pool: callers wait up to 5s for a free connection instead of
+            # opening new ones under load; idle connections are re-checked every 30s
+            pool = redis.BlockingConnectionPool.from_url(
+                REDIS_URL,
+                decode_responses=False,
+                max_connections=REDIS_MAX_CONNECTIONS,
+                timeout=5,
+                health_check_interval=30,
+                socket_keepalive=True,
+            )
+            client = redis.Redis(connection_pool=pool)
+            await client.ping()
+            # Publish only after the ping so no caller sees an unchecked client
+            cls._pool, cls._instance = pool, client
             logger.info("Redis connected successfully")
         except Exception as e:
             logger.error(f"Failed to connect to Redis: {e}")
+            if pool:
+                await pool.disconnect()
             cls._instance = None
+            cls._pool = None
     
     @classmethod
     async def close(cls):
         if cls._instance:
             await cls._instance.close()
+            await cls._pool.disconnect()
             cls._instance = None
+            cls._pool = None
             logger.info("Redis connection closed")
 
 
@@ -39,11 +71,91 @@ async def get_redis_client() -> Optional[redis.Redis]:
     return await RedisCache.get_client()
 
 async def init_redis():
-    await RedisCache._initialize()
+    await RedisCache.get_client()
 
 async def close_redis():
     await RedisCache.close()
 
+# Framed payload: magic, buffer count, buffer lengths, then the protocol 5
+# pickle stream followed by its out-of-band buffers. Values without the magic
+# prefix are plain pickles written by older code and still load normally.
+_OOB_MAGIC = b"QRR5"
+_OOB_COUNT = struct.Struct("<I")
+_OOB_LENGTH = struct.Struct("<Q")
+
+
+def _serialize(data) -> bytes:
+    buffers = []
+    payload = pickle.dumps(data, protocol=5, buffer_callback=buffers.append)
+    if not buffers:
+        return payload
+
+    raw = [buf.raw() for buf in buffers]
+    header = [_OOB_MAGIC, _OOB_COUNT.pack(len(raw) + 1), _OOB_LENGTH.pack(len(payload))]
+    header.extend(_OOB_LENGTH.pack(mv.nbytes) for mv in raw)
+    return b"".join([*header, payload, *raw])
+
+
+def _deserialize(blob: bytes):
+    if not blob.startswith(_OOB_MAGIC):
+        return pickle.loads(blob)
+
+    # Copy once into a writable buffer so the restored arrays are not read-only
+    view = memoryview(bytearray(blob))
+    offset = len(_OOB_MAGIC)
+    (count,) = _OOB_COUNT.unpack_from(view, offset)
+    offset += _OOB_COUNT.size
+    lengths = [_OOB_LENGTH.unpack_from(view, offset + i * _OOB_LENGTH.size)[0] for i in range(count)]
+    offset += count * _OOB_LENGTH.size
+
+    chunks = []
+    for length in lengths:
+        chunks.append(view[offset : offset + length])
+        offset += length
+    return pickle.loads(chunks[0], buffers=chunks[1:])
+
+
+class LocalTTLCache:
+    """Small per-process LRU with a TTL, for hot keys that would otherwise
+    cost a Redis round-trip on every request. Entries may be up to `ttl`
+    seconds behind Redis; clear_cached_data() empties every instance."""
+
+    _instances = weakref.WeakSet()
+
+    def __init__(self, maxsize: int = 64, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        LocalTTLCache._instances.add(self)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def discard(self, key):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+
+def namespaced(cache_key: str) -> str:
+    return f"{CACHE_PREFIX}{cache_key}"
+
+
 async def get_cached_data(cache_key: str):
     client = await RedisCache.get_client()
     if not client:
@@ -51,9 +163,9 @@ async def get_cached_data(cache_key: str):
         return None
     
     try:
-        cached = await client.get(cache_key)
+        cached = await client.get(namespaced(cache_key))
         if cached:
-            return pickle.loads(cached)
+            return _deserialize(cached)
     except Exception as e:
         logger.warning(f"Error loading cached data for key {cache_key}: {e}")
     return None
@@ -65,14 +177,109 @@ async def set_cached_data(cache_key: str, data, expire_seconds: int = 3600):
         return False
     
     try:
-        serialized_data = pickle.dumps(data)
-        await client.set(cache_key, serialized_data, ex=expire_seconds)
+        serialized_data = _serialize(data)
+        await client.set(namespaced(cache_key), serialized_data, ex=expire_seconds)
         logger.info(f"Data cached successfully with key: {cache_key}")
         return True
     except Exception as e:
         logger.warning(f"Error caching data for key {cache_key}: {e}")
         return False
     
+async def get_cached_bytes(cache_key: str) -> Optional[bytes]:
+    """Raw payload stored by set_cached_bytes, e.g. an already-encoded JSON body."""
+    client = await RedisCache.get_client()
+    if not client:
+        logger.warning("Redis client not available")
+        return None
+
+    try:
+        return await client.get(namespaced(cache_key))
+    except Exception as e:
+        logger.warning(f"Error loading cached bytes for key {cache_key}: {e}")
+        return None
+
+async def set_cached_bytes(cache_key: str, payload: bytes, expire_seconds: int = 3600):
+    client = await RedisCache.get_client()
+    if not client:
+        logger.warning("Redis client not available, skipping cache")
+        return False
+
+    try:
+        await client.set(namespaced(cache_key), payload, ex=expire_seconds)
+        logger.info(f"Bytes cached successfully with key: {cache_key}")
+        return True
+    except Exception as e:
+        logger.warning(f"Error caching bytes for key {cache_key}: {e}")
+        return False
+
+async def get_cached_many(cache_keys: list) -> dict:
+    """Fetch several keys in one round-trip; missing or unreadable keys map to None."""
+    client = await RedisCache.get_client()
+    if not client:
+        logger.warning("Redis client not available")
+        return {key: None for key in cache_keys}
+
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            for key in cache_keys:
+                pipe.get(namespaced(key))
+            blobs = await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Error loading cached data for keys {cache_keys}: {e}")
+        return {key: None for key in cache_keys}
+
+    results = {}
+    for key, blob in zip(cache_keys, blobs):
+        try:
+            results[key] = _deserialize(blob) if blob else None
+        except Exception as e:
+            logger.warning(f"Error loading cached data for key {key}: {e}")
+            results[key] = None
+    return results
+
+async def set_cached_many(items: dict, expire_seconds: int = 3600):
+    """Write several keys in one round-trip."""
+    client = await RedisCache.get_client()
+    if not client:
+        logger.warning("Redis client not available, skipping cache")
+        return False
+
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            for key, data in items.items():
+                pipe.set(namespaced(key), _serialize(data), ex=expire_seconds)
+            await pipe.execute()
+        logger.info(f"Data cached successfully with keys: {list(items)}")
+        return True
+    except Exception as e:
+        logger.warning(f"Error caching data for keys {list(items)}: {e}")
+        return False
+
+
+async def clear_cached_data(batch_size: int = 500) -> int:
+    """Drop every cached payload; returns the number of keys removed."""
+    client = await RedisCache.get_client()
+    if not client:
+        logger.warning("Redis client not available")
+        return 0
+
+    for local in list(LocalTTLCache._instances):
+        local.clear()
+
+    # SCAN + UNLINK in batches: the server frees memory in the background
+    # and never blocks other clients the way FLUSHDB does
+    removed = 0
+    batch = []
+    async for key in client.scan_iter(match=f"{CACHE_PREFIX}*", count=batch_size):
+        batch.append(key)
+        if len(batch) >= batch_size:
+            removed += await client.unlink(*batch)
+            batch = []
+    if batch:
+        removed += await client.unlink(*batch)
+    logger.info(f"Cleared {removed} cached keys")
+    return removed
+
 
 RISK_CACHE_KEY = "risk_engine:current_full_risk"
 SYSTEMIC_CACHE_KEY = "risk_engine:systemic_snapshot"
@@ -101,3 +308,13 @@ async def cache_quantile_snapshot(data: dict, expire_seconds: int = 900):
 
 async def get_cached_quantile_snapshot() -> Optional[dict]:
     return await get_cached_data(QUANTILE_CACHE_KEY)
+
+
+async def get_all_cached_snapshots() -> dict:
+    """Full risk, systemic and quantile snapshots in a single pipelined read."""
+    cached = await get_cached_many([RISK_CACHE_KEY, SYSTEMIC_CACHE_KEY, QUANTILE_CACHE_KEY])
+    return {
+        "full_risk": cached[RISK_CACHE_KEY],
+        "systemic": cached[SYSTEMIC_CACHE_KEY],
+        "quantile": cached[QUANTILE_CACHE_KEY],
+    }
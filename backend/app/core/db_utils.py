@@ -1,17 +1,30 @@
 from app.core.db import AsyncSessionLocal
 from app.models.risk import CreditSignalSnapshot, PCASnapshot, SystemicRiskSnapshot, QuantileRegressionSnapshot, RiskSnapshot
 import numpy as np
+import pandas as pd
 from sqlalchemy import and_, select
 from datetime import datetime, timedelta
+from functools import lru_cache
+
+
+def _iso(value):
+    # isoformat skips the Timestamp repr path that str() goes through
+    if not value:
+        return None
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def _as_pydt(value):
+    return value.to_pydatetime() if isinstance(value, pd.Timestamp) else value
 
 
 async def save_credit_snapshot(df, start_date=None, end_date=None):
     async with AsyncSessionLocal() as session:
         # Extract dates from DataFrame if not provided
         if start_date is None and not df.empty:
-            start_date = df.index[0].to_pydatetime() if hasattr(df.index[0], 'to_pydatetime') else df.index[0]
+            start_date = _as_pydt(df.index[0])
         if end_date is None and not df.empty:
-            end_date = df.index[-1].to_pydatetime() if hasattr(df.index[-1], 'to_pydatetime') else df.index[-1]
+            end_date = _as_pydt(df.index[-1])
             
         snapshot = CreditSignalSnapshot(
             start_date=start_date,
@@ -23,8 +36,8 @@ async def save_credit_snapshot(df, start_date=None, end_date=None):
             snapshot_metadata={
                 "columns": list(df.columns),
                 "date_range": {
-                    "start": str(start_date) if start_date else None,
-                    "end": str(end_date) if end_date else None
+                    "start": _iso(start_date),
+                    "end": _iso(end_date)
                 }
             }
         )
@@ -32,30 +45,33 @@ async def save_credit_snapshot(df, start_date=None, end_date=None):
         await session.commit()
 
 
+def build_pca_snapshot(evr, scores, loadings, window, n_components, tickers, start_date=None, end_date=None) -> PCASnapshot:
+    # Extract dates from scores if not provided
+    if start_date is None and scores is not None and not scores.empty:
+        start_date = _as_pydt(scores.index[0])
+    if end_date is None and scores is not None and not scores.empty:
+        end_date = _as_pydt(scores.index[-1])
+        
+    return PCASnapshot(
+        start_date=start_date,
+        end_date=end_date,
+        window=window,
+        n_components=n_components,
+        explained_variance=evr.iloc[-1].to_dict() if evr is not None and not evr.empty else {},
+        pca_metadata={
+            "tickers": tickers, 
+            "latest_scores": scores.iloc[-1].to_dict() if scores is not None and not scores.empty else {},
+            "date_range": {
+                "start": _iso(start_date),
+                "end": _iso(end_date)
+            }
+        }
+    )
+
+
 async def save_pca_snapshot(evr, scores, loadings, window, n_components, tickers, start_date=None, end_date=None):
     async with AsyncSessionLocal() as session:
-        # Extract dates from scores if not provided
-        if start_date is None and scores is not None and not scores.empty:
-            start_date = scores.index[0].to_pydatetime() if hasattr(scores.index[0], 'to_pydatetime') else scores.index[0]
-        if end_date is None and scores is not None and not scores.empty:
-            end_date = scores.index[-1].to_pydatetime() if hasattr(scores.index[-1], 'to_pydatetime') else scores.index[-1]
-            
-        snapshot = PCASnapshot(
-            start_date=start_date,
-            end_date=end_date,
-            window=window,
-            n_components=n_components,
-            explained_variance=evr.iloc[-1].to_dict() if evr is not None and not evr.empty else {},
-            pca_metadata={
-                "tickers": tickers, 
-                "latest_scores": scores.iloc[-1].to_dict() if scores is not None and not scores.empty else {},
-                "date_range": {
-                    "start": str(start_date) if start_date else None,
-                    "end": str(end_date) if end_date else None
-                }
-            }
-        )
-        session.add(snapshot)
+        session.add(build_pca_snapshot(evr, scores, loadings, window, n_components, tickers, start_date, end_date))
         await session.commit()
 
 
@@ -63,9 +79,9 @@ async def save_systemic_snapshot(series, start_date=None, end_date=None):
     async with AsyncSessionLocal() as session:
         # Extract dates from series if not provided
         if start_date is None and not series.empty:
-            start_date = series.index[0].to_pydatetime() if hasattr(series.index[0], 'to_pydatetime') else series.index[0]
+            start_date = _as_pydt(series.index[0])
         if end_date is None and not series.empty:
-            end_date = series.index[-1].to_pydatetime() if hasattr(series.index[-1], 'to_pydatetime') else series.index[-1]
+            end_date = _as_pydt(series.index[-1])
             
         snapshot = SystemicRiskSnapshot(
             start_date=start_date,
@@ -73,11 +89,11 @@ async def save_systemic_snapshot(series, start_date=None, end_date=None):
             mean_value=float(series["Systemic"].mean()),
             std_value=float(series["Systemic"].std()),
             systemic_metadata={
-                "start": str(series.index[0]) if not series.empty else None,
-                "end": str(series.index[-1]) if not series.empty else None,
+                "start": _iso(series.index[0]) if not series.empty else None,
+                "end": _iso(series.index[-1]) if not series.empty else None,
                 "date_range": {
-                    "start": str(start_date) if start_date else None,
-                    "end": str(end_date) if end_date else None
+                    "start": _iso(start_date),
+                    "end": _iso(end_date)
                 }
             }
         )
@@ -87,94 +103,131 @@ async def save_systemic_snapshot(series, start_date=None, end_date=None):
         return snapshot
 
 
+def build_quantile_snapshot(summary_dict, results=None, start_date=None, end_date=None) -> QuantileRegressionSnapshot:
+    return QuantileRegressionSnapshot(
+        start_date=start_date,
+        end_date=end_date,
+        var_95=summary_dict.get("VaR_95"),
+        var_normal=summary_dict.get("VaR_Normal"),
+        capital_buffer=summary_dict.get("Capital_Buffer"),
+        corr_mean=summary_dict["Correlation_Risk"].get("mean_corr") if "Correlation_Risk" in summary_dict else None,
+        corr_vol=summary_dict["Correlation_Risk"].get("vol_corr") if "Correlation_Risk" in summary_dict else None,
+        corr_beta=summary_dict["Correlation_Risk"].get("corr_beta") if "Correlation_Risk" in summary_dict else None,
+        corr_contrib_to_loss=summary_dict["Correlation_Risk"].get("corr_contrib_to_loss") if "Correlation_Risk" in summary_dict else None,
+        quantile_metadata={
+            "quantiles": list(results.keys()) if results else None,
+            "date_range": {
+                "start": _iso(start_date),
+                "end": _iso(end_date)
+            }
+        }
+    )
+
+
 async def save_quantile_results(summary_dict, results=None, start_date=None, end_date=None):
     async with AsyncSessionLocal() as session:
-        snapshot = QuantileRegressionSnapshot(
-            start_date=start_date,
-            end_date=end_date,
-            var_95=summary_dict.get("VaR_95"),
-            var_normal=summary_dict.get("VaR_Normal"),
-            capital_buffer=summary_dict.get("Capital_Buffer"),
-            corr_mean=summary_dict["Correlation_Risk"].get("mean_corr") if "Correlation_Risk" in summary_dict else None,
-            corr_vol=summary_dict["Correlation_Risk"].get("vol_corr") if "Correlation_Risk" in summary_dict else None,
-            corr_beta=summary_dict["Correlation_Risk"].get("corr_beta") if "Correlation_Risk" in summary_dict else None,
-            corr_contrib_to_loss=summary_dict["Correlation_Risk"].get("corr_contrib_to_loss") if "Correlation_Risk" in summary_dict else None,
-            quantile_metadata={
-                "quantiles": list(results.keys()) if results else None,
-                "date_range": {
-                    "start": str(start_date) if start_date else None,
-                    "end": str(end_date) if end_date else None
-                }
-            }
-        )
+        snapshot = build_quantile_snapshot(summary_dict, results, start_date, end_date)
         session.add(snapshot)
         await session.commit()
         await session.refresh(snapshot)
         return snapshot
+
+
+def build_risk_snapshot(metrics: dict, start_date: datetime = None, end_date: datetime = None) -> RiskSnapshot:
+    safe_metrics = metrics.copy()
     
-async def save_risk_snapshot(metrics: dict, start_date: datetime = None, end_date: datetime = None):
-    async with AsyncSessionLocal() as session:
-        safe_metrics = metrics.copy()
-        
-        unsupported_fields = [
-            'pca_component', 'credit_component', 'quantile_signal', 
-            'dcc_correlation', 'corr_exceeds_bootstrap', 'har_excess_vol_z',
-            'credit_spread_change', 'ig_spread_change', 'vix_change',
-            'is_warning', 'composite_risk_score', 'regime_details',
-            'signal_analysis', 'component_analysis'
-        ]
+    unsupported_fields = [
+        'pca_component', 'credit_component', 'quantile_signal', 
+        'dcc_correlation', 'corr_exceeds_bootstrap', 'har_excess_vol_z',
+        'credit_spread_change', 'ig_spread_change', 'vix_change',
+        'is_warning', 'composite_risk_score', 'regime_details',
+        'signal_analysis', 'component_analysis'
+    ]
+    
+    for field in unsupported_fields:
+        safe_metrics.pop(field, None)
+    
+    return RiskSnapshot(
+        # Date range
+        start_date=start_date or datetime.utcnow() - timedelta(days=1),
+        end_date=end_date or datetime.utcnow(),
         
-        for field in unsupported_fields:
-            safe_metrics.pop(field, None)
+        # Risk metrics (only include fields that exist in the schema)
+        systemic_risk=safe_metrics.get("systemic_risk"),
+        systemic_mean=safe_metrics.get("systemic_mean"),
+        systemic_std=safe_metrics.get("systemic_std"),
+        credit_spread=safe_metrics.get("credit_spread"),
+        market_volatility=safe_metrics.get("market_volatility"),
+        risk_level=safe_metrics.get("risk_level"),
+        dcc_correlation=safe_metrics.get("dcc_correlation"),
+        macro_oil=safe_metrics.get("macro_oil"),
+        macro_fx=safe_metrics.get("macro_fx"),
+        forecast_next_risk=safe_metrics.get("forecast_next_risk"),
+        data_points=safe_metrics.get("data_points"),
+        computation_time=safe_metrics.get("computation_time"),
+        source=safe_metrics.get("source", "risk_engine"),
         
-        snapshot = RiskSnapshot(
-            # Date range
-            start_date=start_date or datetime.utcnow() - timedelta(days=1),
-            end_date=end_date or datetime.utcnow(),
-            
-            # Risk metrics (only include fields that exist in the schema)
-            systemic_risk=safe_metrics.get("systemic_risk"),
-            systemic_mean=safe_metrics.get("systemic_mean"),
-            systemic_std=safe_metrics.get("systemic_std"),
-            credit_spread=safe_metrics.get("credit_spread"),
-            market_volatility=safe_metrics.get("market_volatility"),
-            risk_level=safe_metrics.get("risk_level"),
-            dcc_correlation=safe_metrics.get("dcc_correlation"),
-            macro_oil=safe_metrics.get("macro_oil"),
-            macro_fx=safe_metrics.get("macro_fx"),
-            forecast_next_risk=safe_metrics.get("forecast_next_risk"),
-            data_points=safe_metrics.get("data_points"),
-            computation_time=safe_metrics.get("computation_time"),
-            source=safe_metrics.get("source", "risk_engine"),
-            
-            # Rich metadata - store new signals in JSON fields
-            quantile_summary=safe_metrics.get("quantile_summary", {}),
-            pca_variance=safe_metrics.get("pca_variance", {}),
-            extra_metadata={
-                "pca_metadata": safe_metrics.get("pca_metadata", {}),
-                "computation_duration": safe_metrics.get("computation_duration"),
-                "timestamp": safe_metrics.get("timestamp"),
-                # Store new signals in the extra_metadata JSON field
-                "enhanced_signals": {
-                    "quantile_signal": metrics.get("quantile_signal"),
-                    "dcc_correlation": metrics.get("dcc_correlation"),
-                    "har_excess_vol": metrics.get("har_excess_vol"),
-                    "credit_spread_change": metrics.get("credit_spread_change"),
-                    "vix_change": metrics.get("vix_change"),
-                    "composite_warning": metrics.get("composite_warning"),
-                    "composite_risk_score": metrics.get("composite_risk_score"),
-                    "regime_details": metrics.get("regime_details"),
-                    "signal_analysis": metrics.get("signal_analysis"),
-                    "component_analysis": metrics.get("component_analysis")
-                }
+        # Rich metadata - store new signals in JSON fields
+        quantile_summary=safe_metrics.get("quantile_summary", {}),
+        pca_variance=safe_metrics.get("pca_variance", {}),
+        extra_metadata={
+            "pca_metadata": safe_metrics.get("pca_metadata", {}),
+            "computation_duration": safe_metrics.get("computation_duration"),
+            "timestamp": safe_metrics.get("timestamp"),
+            # Store new signals in the extra_metadata JSON field
+            "enhanced_signals": {
+                "quantile_signal": metrics.get("quantile_signal"),
+                "dcc_correlation": metrics.get("dcc_correlation"),
+                "har_excess_vol": metrics.get("har_excess_vol"),
+                "credit_spread_change": metrics.get("credit_spread_change"),
+                "vix_change": metrics.get("vix_change"),
+                "composite_warning": metrics.get("composite_warning"),
+                "composite_risk_score": metrics.get("composite_risk_score"),
+                "regime_details": metrics.get("regime_details"),
+                "signal_analysis": metrics.get("signal_analysis"),
+                "component_analysis": metrics.get("component_analysis")
             }
-        )
+        }
+    )
+
+
+async def save_risk_snapshot(metrics: dict, start_date: datetime = None, end_date: datetime = None):
+    async with AsyncSessionLocal() as session:
+        snapshot = build_risk_snapshot(metrics, start_date, end_date)
         session.add(snapshot)
         await session.commit()
         await session.refresh(snapshot)
         return snapshot
 
 
+# Bulk writers for backfills: one session and one commit for the whole batch
+# instead of a round-trip (and fsync) per snapshot. Build rows with the
+# build_*_snapshot helpers above.
+async def _save_snapshots_bulk(snapshots: list):
+    async with AsyncSessionLocal() as session:
+        session.add_all(snapshots)
+        await session.commit()
+    return snapshots
+
+
+async def save_pca_snapshots_bulk(snapshots: list):
+    return await _save_snapshots_bulk(snapshots)
+
+
+async def save_quantile_snapshots_bulk(snapshots: list):
+    return await _save_snapshots_bulk(snapshots)
+
+
+async def save_risk_snapshots_bulk(snapshots: list):
+    return await _save_snapshots_bulk(snapshots)
+
+
+@lru_cache(maxsize=1024)
+def _parse_iso(value: str) -> datetime:
+    # Dashboard polling sends the same few range strings over and over
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
 async def get_risk_snapshots_by_date_range(start_date: str = None, end_date: str = None, days: int = None):
     async with AsyncSessionLocal() as session:
         query = select(RiskSnapshot)
@@ -189,8 +242,8 @@ async def get_risk_snapshots_by_date_range(start_date: str = None, end_date: str
                 )
             )
         elif start_date and end_date:
-            start_date_filter = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-            end_date_filter = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+            start_date_filter = _parse_iso(start_date)
+            end_date_filter = _parse_iso(end_date)
             query = query.where(
                 and_(
                     RiskSnapshot.start_date >= start_date_filter,
@@ -198,10 +251,10 @@ async def get_risk_snapshots_by_date_range(start_date: str = None, end_date: str
                 )
             )
         elif start_date:
-            start_date_filter = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
+            start_date_filter = _parse_iso(start_date)
             query = query.where(RiskSnapshot.start_date >= start_date_filter)
         elif end_date:
-            end_date_filter = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+            end_date_filter = _parse_iso(end_date)
             query = query.where(RiskSnapshot.end_date <= end_date_filter)
         
         query = query.order_by(RiskSnapshot.start_date.asc())
@@ -221,10 +274,10 @@ async def get_risk_snapshots_with_signals(
         query = select(RiskSnapshot)
         
         if start_date:
-            start_date_filter = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
+            start_date_filter = _parse_iso(start_date)
             query = query.where(RiskSnapshot.start_date >= start_date_filter)
         if end_date:
-            end_date_filter = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+            end_date_filter = _parse_iso(end_date)
             query = query.where(RiskSnapshot.end_date <= end_date_filter)
         
         if min_composite_score is not None:
@@ -5,7 +5,30 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-def get_historical_risk_by_range(start_date: str = None, end_date: str = None, days: int = None):
+REGIME_INTERPRETATIONS = {
+    "RED": "High systemic risk detected. Monitor markets closely.",
+    "YELLOW": "Elevated risk levels. Increased vigilance recommended.",
+    "GREEN": "Normal market conditions. Standard monitoring procedures.",
+}
+
+
+def _generate_signals(n, seed=None):
+    """Simulate systemic, PCA and credit scores for n trading days."""
+    # Draw all randomness up front instead of three scalar draws per day
+    rng = np.random.default_rng(seed)
+    noise = rng.normal(0, 0.15, n)
+    eps_pca = rng.normal(0, 0.1, n)
+    eps_credit = rng.normal(0, 0.12, n)
+
+    day = np.arange(n)
+    base_risk = 0.3 + 0.4 * np.sin(day / 30)  # Monthly cycles
+    market_shock = np.where(day % 120 == 0, 0.8, 0.0)
+
+    systemic = np.clip(base_risk + market_shock + noise, -2, 2)
+    return systemic, systemic * 0.9 + eps_pca, systemic * 0.7 + eps_credit
+
+
+def get_historical_risk_by_range(start_date: str = None, end_date: str = None, days: int = None, seed: int = None):
     """
     Generate historical risk data for the frontend with flexible date ranges.
     
@@ -13,6 +36,7 @@ def get_historical_risk_by_range(start_date: str = None, end_date: str = None, d
         start_date: Start date in 'YYYY-MM-DD' format
         end_date: End date in 'YYYY-MM-DD' format  
         days: Number of days from end_date backwards (alternative to start_date)
+        seed: Optional RNG seed for reproducible output
     """
     try:
         # Determine date range
@@ -36,40 +60,20 @@ def get_historical_risk_by_range(start_date: str = None, end_date: str = None, d
         # Generate business days only (exclude weekends)
         dates = pd.date_range(start=start_date, end=end_date, freq='B')  # 'B' = business days
         
-        risk_data = []
-        
-        for i, date in enumerate(dates):
-            time_factor = i / 30  # Monthly cycles
-            
-            base_risk = 0.3 + 0.4 * np.sin(time_factor)
-            market_shock = 0.8 if i % 120 == 0 else 0.0
-            noise = np.random.normal(0, 0.15)
-            
-            systemic_risk = max(-2, min(2, base_risk + market_shock + noise))
-            pca_signal = systemic_risk * 0.9 + np.random.normal(0, 0.1)
-            credit_signal = systemic_risk * 0.7 + np.random.normal(0, 0.12)
-            
-            if systemic_risk >= 0.5:
-                regime = "RED"
-                interpretation = "High systemic risk detected. Monitor markets closely."
-            elif systemic_risk > 0.0:
-                regime = "YELLOW" 
-                interpretation = "Elevated risk levels. Increased vigilance recommended."
-            else:
-                regime = "GREEN"
-                interpretation = "Normal market conditions. Standard monitoring procedures."
-            
-            risk_data.append({
-                "date": date.strftime('%Y-%m-%d'),
-                "systemic_risk": float(systemic_risk), 
-                "pca_signal_score": float(pca_signal),
-                "credit_signal_score": float(credit_signal),
-                "market_regime": regime,
-                "risk_interpretation": interpretation
-            })
+        systemic, pca, credit = _generate_signals(len(dates), seed)
+        regime = np.select([systemic >= 0.5, systemic > 0.0], ["RED", "YELLOW"], default="GREEN")
+
+        risk_data = pd.DataFrame({
+            "date": dates.strftime('%Y-%m-%d'),
+            "systemic_risk": systemic,
+            "pca_signal_score": pca,
+            "credit_signal_score": credit,
+            "market_regime": regime,
+            "risk_interpretation": pd.Series(regime).map(REGIME_INTERPRETATIONS).to_numpy(),
+        })
         
         logger.info(f"Generated {len(risk_data)} trading days of risk data from {start_date.date()} to {end_date.date()}")
-        return pd.DataFrame(risk_data)
+        return risk_data
         
     except Exception as e:
         logger.error(f"Error generating historical risk data: {e}")
@@ -0,0 +1,46 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+import ormsgpack
+import pandas as pd
+from fastapi.responses import JSONResponse
+
+
+def orjson_default(obj):
+    """Fallback for the few types orjson doesn't encode natively."""
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return obj.tolist()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    # orjson writes NaN/inf as null and encodes numpy scalars/arrays in C
+    return orjson.dumps(
+        content,
+        default=orjson_default,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+    )
+
+
+def packb(content: Any) -> bytes:
+    # MessagePack counterpart of dumps for clients that ask for it; floats go
+    # out as 9-byte binary doubles, and NaN stays NaN rather than null
+    return ormsgpack.packb(
+        content,
+        default=orjson_default,
+        option=ormsgpack.OPT_SERIALIZE_NUMPY | ormsgpack.OPT_NON_STR_KEYS,
+    )
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, including numpy/pandas values."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
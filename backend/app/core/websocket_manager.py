@@ -1,5 +1,7 @@
 from typing import List
 from fastapi import WebSocket
+from app.core.responses import dumps
+import asyncio
 import logging
 
 logger = logging.getLogger("socket_manager")
@@ -21,9 +23,18 @@ class SnapshotWebSocketManager:
 
     async def broadcast(self, message: dict):
         logger.info(f"Broadcasting to {len(self.active_connections)} clients")
-        for connection in list(self.active_connections):
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.warning(f"⚠️ Failed to send message: {e}")
+        connections = list(self.active_connections)
+        if not connections:
+            return
+
+        # Encode once for everyone and send concurrently, so one slow client
+        # doesn't hold up the rest
+        payload = dumps(message).decode()
+        results = await asyncio.gather(
+            *(connection.send_text(payload) for connection in connections),
+            return_exceptions=True
+        )
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                logger.warning(f"⚠️ Failed to send message: {result}")
                 self.disconnect(connection)
@@ -3,19 +3,47 @@ load_dotenv()
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.core.db import init_db
-from app.core.cache import RedisCache, get_redis_client
+from app.core.db import engine, init_db
+from app.core.cache import RedisCache, get_redis_client, get_cached_data, set_cached_data, clear_cached_data, namespaced
 from app.routers import analytics, risk, stream
 from app.core.websocket_manager import SnapshotWebSocketManager
-from app.services.data_pipeline import initialize_fred_client, get_credit_signals
+from app.services.data_pipeline import initialize_fred_client, get_credit_signals, unpack_cached_frame
 import asyncio
-import pickle
+import os
+import random
+import socket
+import time
+
+from sqlalchemy import text
 
 
 app = FastAPI(title="Systemic Risk Engine")
 snapshot_ws_manager = SnapshotWebSocketManager()
 background_task_started = False
 
+# Cross-worker lease so only one process recomputes credit signals at a time;
+# the others read what it caches.
+REFRESH_LOCK_KEY = "lock:credit_signals_refresh"
+REFRESH_LOCK_TTL = 300
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+# After a failed refresh, retry this soon instead of waiting a full interval
+REFRESH_RETRY_SECONDS = 600
+READINESS_TIMEOUT = 2.0
+
+# Compare-and-act on the lease, atomic on the Redis server
+_RELEASE_LEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+_RENEW_LEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
 # Routers
 app.include_router(risk.router, prefix="/risk", tags=["Risk"])
 app.include_router(stream.router, tags=["WebSocket"])
@@ -31,60 +59,170 @@ app.add_middleware(
 )
 
 
+# === REFRESH LEASE ===
+async def _acquire_refresh_lease(redis_client) -> bool:
+    """SET NX EX lease; without Redis every worker refreshes on its own."""
+    if not redis_client:
+        return True
+    try:
+        return bool(await redis_client.set(REFRESH_LOCK_KEY, WORKER_ID, nx=True, ex=REFRESH_LOCK_TTL))
+    except Exception as e:
+        print(f"⚠️ Could not take refresh lease: {e}")
+        return True
+
+
+async def _keep_refresh_lease(redis_client):
+    """Extend the lease while a refresh runs, so a slow Yahoo/FRED fetch
+    doesn't outlive it and let a second worker start the same refresh.
+    Run as a task and cancel it once the refresh is done."""
+    if not redis_client:
+        return
+    while True:
+        await asyncio.sleep(REFRESH_LOCK_TTL / 3)
+        try:
+            if not await redis_client.eval(_RENEW_LEASE_SCRIPT, 1, REFRESH_LOCK_KEY, WORKER_ID, REFRESH_LOCK_TTL * 1000):
+                print("⚠️ Refresh lease lost — another worker may start refreshing.")
+                return
+        except Exception as e:
+            print(f"⚠️ Could not extend refresh lease: {e}")
+
+
+async def _release_refresh_lease(redis_client):
+    if not redis_client:
+        return
+    try:
+        # Only drop the lease if it is still ours (it may have expired and been
+        # re-taken); compare and delete in one script so nothing slips between
+        await redis_client.eval(_RELEASE_LEASE_SCRIPT, 1, REFRESH_LOCK_KEY, WORKER_ID)
+    except Exception as e:
+        print(f"⚠️ Could not release refresh lease: {e}")
+
+
+def _jittered(seconds: float) -> float:
+    # ±10% so workers started together don't refresh in phase
+    return seconds * random.uniform(0.9, 1.1)
+
+
 # === BACKGROUND REFRESH ===
 async def background_refresh(interval_hours: int = 24):
-    """Runs every <interval_hours> after the last refresh."""
+    """
+    Runs every <interval_hours> (±10%) after the last successful refresh.
+    Setting app.state.refresh_wakeup triggers a run immediately and re-bases the schedule.
+    """
     global background_task_started
     if background_task_started:
         print("⚠️ Background refresh already running — skipping duplicate task.")
         return
     background_task_started = True
 
-    print(f"✅ Background refresh loop started. Next run in {interval_hours}h.")
+    wakeup = app.state.refresh_wakeup
+    interval = interval_hours * 3600
+    # Jitter is drawn once per scheduled run, so re-reading the deadline
+    # never moves it
+    next_due = time.monotonic() + _jittered(interval)
 
-    # Wait 24 hours before the first refresh
-    await asyncio.sleep(interval_hours * 3600)
+    print(f"✅ Background refresh loop started. Next run in ~{interval_hours}h.")
 
     while True:
         try:
-            print("🔄 Background refresh: updating market/credit data...")
-            await get_credit_signals(force_refresh=True)
-            print("✅ Credit data successfully refreshed.")
-        except Exception as e:
-            print(f"❌ Background refresh failed: {e}")
+            await asyncio.wait_for(wakeup.wait(), timeout=max(0.0, next_due - time.monotonic()))
+            print("⏰ Background refresh triggered early.")
+        except asyncio.TimeoutError:
+            pass
+        wakeup.clear()
+
+        redis_client = await get_redis_client()
+        if await _acquire_refresh_lease(redis_client):
+            keepalive = asyncio.create_task(_keep_refresh_lease(redis_client))
+            try:
+                print("🔄 Background refresh: updating market/credit data...")
+                await get_credit_signals(force_refresh=True)
+                next_due = time.monotonic() + _jittered(interval)
+                print("✅ Credit data successfully refreshed.")
+            except Exception as e:
+                next_due = time.monotonic() + REFRESH_RETRY_SECONDS
+                print(f"❌ Background refresh failed: {e}")
+            finally:
+                keepalive.cancel()
+                await _release_refresh_lease(redis_client)
+        else:
+            # The lease holder is doing this run for everyone
+            next_due = time.monotonic() + _jittered(interval)
+            print("⏭️ Another worker is refreshing credit data — skipping this run.")
+
+        print(f"🕓 Sleeping {(next_due - time.monotonic()) / 3600:.1f}h until next refresh...")
+
+
+async def _await_ready(redis_client) -> bool:
+    """Confirm DB and Redis answer before startup leans on them; returns
+    whether Redis did."""
+    try:
+        async with engine.connect() as conn:
+            await asyncio.wait_for(conn.execute(text("SELECT 1")), timeout=READINESS_TIMEOUT)
+    except Exception as e:
+        print(f"⚠️ DB readiness check failed: {e}")
 
-        print(f"🕓 Sleeping {interval_hours}h until next refresh...")
-        await asyncio.sleep(interval_hours * 3600)
+    if not redis_client:
+        return False
+    try:
+        await asyncio.wait_for(redis_client.ping(), timeout=READINESS_TIMEOUT)
+        return True
+    except Exception as e:
+        print(f"⚠️ Redis readiness check failed: {e}")
+        return False
 
 
 @app.on_event("startup")
 async def startup_event():
     initialize_fred_client()
     await init_db()
-    await RedisCache._initialize()
+    await RedisCache.get_client()
 
     redis_client = await get_redis_client()
+    redis_ready = await _await_ready(redis_client)
     
-    if redis_client:
+    if redis_client and not redis_ready:
+        print("⚠️ Redis not answering — skipping cache warm-up.")
+    elif redis_client:
         print("✅ Startup: Redis & DB initialized.")
-        try:
-            # Warm up cache if not already there
-            print("⚙️ Warming up cache with credit signals...")
-            await get_credit_signals(force_refresh=False, _internal_call=True)
-            print("✅ Cache warm-up complete.")
-        except Exception as e:
-            print(f"❌ Cache warm-up failed: {e}")
+        if await _acquire_refresh_lease(redis_client):
+            keepalive = asyncio.create_task(_keep_refresh_lease(redis_client))
+            try:
+                # Warm up cache if not already there
+                print("⚙️ Warming up cache with credit signals...")
+                await get_credit_signals(force_refresh=False, _internal_call=True)
+                print("✅ Cache warm-up complete.")
+            except Exception as e:
+                print(f"❌ Cache warm-up failed: {e}")
+            finally:
+                keepalive.cancel()
+                await _release_refresh_lease(redis_client)
+        else:
+            # Another worker is warming up; wait (bounded) for its result
+            print("⏳ Another worker is warming up the cache — waiting for credit signals...")
+            for _ in range(30):
+                if await redis_client.exists(namespaced("credit_signals")):
+                    print("✅ Cache warm-up complete (by another worker).")
+                    break
+                await asyncio.sleep(1)
+            else:
+                print("⚠️ Cache warm-up by another worker did not finish in time.")
     else:
         print("⚠️ Redis unavailable. Only DB initialized.")
 
-    await asyncio.sleep(2)
-    
-
-    asyncio.create_task(background_refresh(interval_hours=24))
+    app.state.refresh_wakeup = asyncio.Event()
+    app.state.refresh_task = asyncio.create_task(background_refresh(interval_hours=24))
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    refresh_task = getattr(app.state, "refresh_task", None)
+    if refresh_task:
+        refresh_task.cancel()
+        try:
+            await refresh_task
+        except asyncio.CancelledError:
+            pass
     await RedisCache.close()
     print("🛑 Shutdown: Redis connection closed.")
 
@@ -96,11 +234,16 @@ async def cache_status():
 
     if redis_client:
         try:
-            keys = await redis_client.keys("*")
-            status["cache_keys"] = keys
+            # One round-trip: a bounded SCAN page (never KEYS *) plus the
+            # read/write probe
             test_key = "health_check"
-            await redis_client.set(test_key, "test", ex=10)
-            val = await redis_client.get(test_key)
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.scan(0, match=namespaced("*"), count=500)
+                pipe.set(test_key, "test", ex=10)
+                pipe.get(test_key)
+                (cursor, keys), _, val = await pipe.execute()
+            status["cache_keys"] = keys
+            status["cache_keys_truncated"] = cursor != 0
             status["read_write_test"] = val == b"test"
         except Exception as e:
             status["error"] = str(e)
@@ -116,16 +259,29 @@ async def debug_credit_signals_cache():
 
     try:
         cache_key = "credit_signals"
-        cached = await redis_client.get(cache_key)
-        if not cached:
-            return {"cached": False, "message": "No cached data found"}
+        meta = await get_cached_data(f"{cache_key}:meta")
+        if meta is None:
+            # Written before the summary key existed: fall back to the frame
+            cached = await get_cached_data(cache_key)
+            if cached is None:
+                return {"cached": False, "message": "No cached data found"}
+            data, _ = unpack_cached_frame(cached)
+            meta = {
+                "rows": len(data),
+                "columns": list(data.columns),
+                "latest_date": str(data.index[-1]) if not data.empty else "empty",
+            }
+            # Backfill the summary so later checks skip the full frame; it
+            # expires with the frame it describes
+            ttl = await redis_client.ttl(namespaced(cache_key))
+            if ttl > 0:
+                await set_cached_data(f"{cache_key}:meta", meta, expire_seconds=ttl)
 
-        data = pickle.loads(cached)
         return {
             "cached": True,
-            "data_shape": f"{len(data)} rows × {len(data.columns)} columns",
-            "columns": list(data.columns),
-            "latest_date": str(data.index[-1]) if not data.empty else "empty",
+            "data_shape": f"{meta['rows']} rows × {len(meta['columns'])} columns",
+            "columns": meta["columns"],
+            "latest_date": meta["latest_date"],
         }
     except Exception as e:
         return {"error": f"Error reading cache: {e}"}
@@ -138,8 +294,12 @@ async def clear_cache():
         return {"message": "Redis not available"}
 
     try:
-        await redis_client.flushdb()
-        return {"message": "Cache cleared successfully"}
+        removed = await clear_cached_data()
+        # Repopulate right away rather than at the next scheduled refresh
+        wakeup = getattr(app.state, "refresh_wakeup", None)
+        if wakeup:
+            wakeup.set()
+        return {"message": "Cache cleared successfully", "keys_removed": removed}
     except Exception as e:
         return {"error": str(e)}
 
@@ -3,48 +3,40 @@ from app.services.visualization_service import visualization_service
 # from app.services.risk_engine import RiskEngine
 from app.services.data_pipeline import get_full_market_dataset, get_credit_signals, get_sector_data
 from app.services.systemic_risk import compute_systemic_risk
+import asyncio
 import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple, Union
 import traceback
 import json
 import numpy as np
 import pandas as pd
-from decimal import Decimal
+from app.core.responses import ORJSONResponse
+from app.core.analytics.rolling import rolling_corr, rolling_quantile, rolling_std
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-def safe_json_serializer(obj):
-    """Handle problematic JSON values"""
-    if isinstance(obj, (np.float32, np.float64, np.int32, np.int64)):
-        return float(obj) if not np.isnan(obj) and np.isfinite(obj) else None
-    elif isinstance(obj, float):
-        return obj if not np.isnan(obj) and np.isfinite(obj) else None
-    elif isinstance(obj, (np.ndarray, pd.Series)):
-        return obj.tolist()
-    elif isinstance(obj, pd.Timestamp):
-        return obj.isoformat()
-    elif pd.isna(obj):
-        return None
-    elif isinstance(obj, Decimal):
-        return float(obj)
-    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+# Assets shown in the market overview, in display order
+MAJOR_ASSETS = ('SPY', 'HYG', 'LQD', 'XLF', 'XLK')
 
-
-@router.get("/visualization/risk-cascade")
+@router.get("/visualization/risk-cascade", response_class=ORJSONResponse)
 async def get_risk_cascade_visualization(force_refresh: bool = False):
     try:
-        market_data = await get_full_market_dataset(force_refresh=force_refresh)
+        # Independent fetches: run them concurrently
+        market_data, (systemic_df, pca_meta) = await asyncio.gather(
+            get_full_market_dataset(force_refresh=force_refresh),
+            compute_systemic_risk(force_refresh=force_refresh),
+        )
         
         if market_data.empty:
             raise HTTPException(status_code=404, detail="No market data available")
         
-        systemic_df, pca_meta = await compute_systemic_risk(force_refresh=force_refresh)
-        
         risk_signals = await _generate_comprehensive_risk_signals(systemic_df, market_data)
         
         visualization_data = visualization_service.generate_risk_cascade_data(risk_signals)
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "data": visualization_data,
             "metadata": {
@@ -53,123 +45,169 @@ async def get_risk_cascade_visualization(force_refresh: bool = False):
                 "computation_timestamp": pd.Timestamp.now().isoformat()
             },
             "message": "Risk cascade visualization data generated successfully"
-        }
+        })
         
     except Exception as e:
         logger.error(f"Error generating risk cascade visualization: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _align(values: np.ndarray, source_index: pd.Index, index: pd.Index) -> np.ndarray:
+    """Re-index an array computed on `source_index` onto `index`."""
+    if source_index.equals(index):
+        return values
+    return pd.Series(values, index=source_index).reindex(index).to_numpy()
+
+
+def _ffill(values: np.ndarray) -> np.ndarray:
+    """Column-wise forward fill of a 2-D array (leading NaNs stay NaN)."""
+    rows = np.arange(len(values))[:, None]
+    last_valid = np.where(np.isnan(values), 0, rows)
+    np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+    return values[last_valid, np.arange(values.shape[1])]
+
+
+def _column_quantiles(values: np.ndarray, q: float) -> np.ndarray:
+    """NaN-skipping, linearly interpolated quantile of each column from a single partition."""
+    n_valid = np.count_nonzero(~np.isnan(values), axis=0)
+    h = q * (n_valid - 1)
+    lo = np.floor(h).astype(int)
+    hi = np.minimum(lo + 1, n_valid - 1)
+    # NaNs sort last as +inf, so the first n_valid rows of each column are its data
+    part = np.partition(np.where(np.isnan(values), np.inf, values), np.unique(np.r_[lo, hi]), axis=0)
+    cols = np.arange(values.shape[1])
+    with np.errstate(invalid="ignore"):
+        out = part[lo, cols] + (h - lo) * (part[hi, cols] - part[lo, cols])
+    return np.where(n_valid > 0, out, np.nan)
+
+
+def _zscore(values: np.ndarray) -> np.ndarray:
+    """NaN-skipping z-score with pandas' sample std."""
+    valid = values[~np.isnan(values)]
+    if len(valid) < 2:
+        return np.full(len(values), np.nan)
+    return (values - valid.mean()) / valid.std(ddof=1)
+
+
 async def _generate_comprehensive_risk_signals(systemic_df: pd.DataFrame, market_data: pd.DataFrame) -> pd.DataFrame:
     """
     Generate comprehensive risk signals by combining systemic risk with other risk measures.
     """
-    risk_signals = pd.DataFrame(index=systemic_df.index)
+    index = systemic_df.index
+    cols = frozenset(market_data.columns)
+    signals = {}
     
     # 1. Systemic Score (from PCA + Credit)
-    risk_signals['Systemic_Score'] = systemic_df['Systemic']
+    signals['Systemic_Score'] = systemic_df['Systemic'].to_numpy(dtype=np.float64)
     
     # 2. Quantile Signal (5th percentile of HYG returns)
-    if 'HYG' in market_data.columns:
+    if 'HYG' in cols:
         hyg_returns = market_data['HYG'].dropna()
-        risk_signals['Quantile_Signal'] = hyg_returns.rolling(window=63).quantile(0.05)  # 3-month rolling 5th percentile
+        quantile_signal = rolling_quantile(hyg_returns.to_numpy(dtype=np.float64), 63, 0.05)  # 3-month rolling 5th percentile
+        signals['Quantile_Signal'] = _align(quantile_signal, hyg_returns.index, index)
     
     # 3. DCC Correlation Signal (XLK vs XLF if available)
-    if 'XLK' in market_data.columns and 'XLF' in market_data.columns:
-        xlk_returns = market_data['XLK'].dropna()
-        xlf_returns = market_data['XLF'].dropna()
+    if 'XLK' in cols and 'XLF' in cols:
+        pair = market_data[['XLK', 'XLF']].dropna(how='all')
         
         # Simple rolling correlation as proxy for DCC
-        rolling_corr = xlk_returns.rolling(window=21).corr(xlf_returns)
-        risk_signals['DCC_Corr'] = rolling_corr
+        dcc_corr = rolling_corr(pair['XLK'].to_numpy(dtype=np.float64), pair['XLF'].to_numpy(dtype=np.float64), 21)
+        signals['DCC_Corr'] = _align(dcc_corr, pair.index, index)
         
         # Bootstrap exceedance
-        risk_signals['Corr_Exceeds_Bootstrap'] = (rolling_corr > rolling_corr.quantile(0.95)).astype(int)
+        exceeds = (dcc_corr > np.nanquantile(dcc_corr, 0.95)).astype(int)
+        signals['Corr_Exceeds_Bootstrap'] = _align(exceeds, pair.index, index)
     
     # 4. HAR Excess Volatility
-    if 'SPY' in market_data.columns:
+    if 'SPY' in cols:
         spy_returns = market_data['SPY'].dropna()
+        spy = spy_returns.to_numpy(dtype=np.float64)
         
-        # Realized volatility (21-day)
-        realized_vol = spy_returns.rolling(window=21).std()
-        
-        # HAR model components
-        daily_vol = spy_returns.rolling(window=1).std()
-        weekly_vol = spy_returns.rolling(window=5).std()
-        monthly_vol = spy_returns.rolling(window=21).std()
+        # HAR model components; the 21-day realized vol is the monthly component
+        weekly_vol = rolling_std(spy, 5)
+        monthly_vol = rolling_std(spy, 21)
+        realized_vol = monthly_vol
         
         # HAR forecast (simplified)
-        har_forecast = (daily_vol + weekly_vol + monthly_vol) / 3
+        har_forecast = (weekly_vol + monthly_vol) / 2
         excess_vol = realized_vol - har_forecast
         
         # Z-score of excess vol
-        risk_signals['HAR_ExcessVol_Z'] = (excess_vol - excess_vol.mean()) / excess_vol.std()
+        signals['HAR_ExcessVol_Z'] = _align(_zscore(excess_vol), spy_returns.index, index)
     
     # 5. Credit Spread Signals
-    if 'HY_Spread_Change' in market_data.columns:
-        risk_signals['Credit_Spread_Change'] = market_data['HY_Spread_Change']
+    if 'HY_Spread_Change' in cols:
+        signals['Credit_Spread_Change'] = market_data['HY_Spread_Change']
     
-    if 'IG_Spread_Change' in market_data.columns:
-        risk_signals['IG_Spread_Change'] = market_data['IG_Spread_Change']
+    if 'IG_Spread_Change' in cols:
+        signals['IG_Spread_Change'] = market_data['IG_Spread_Change']
     
     # 6. Volatility Signals
-    if 'VIX_Change' in market_data.columns:
-        risk_signals['VIX_Change'] = market_data['VIX_Change']
+    if 'VIX_Change' in cols:
+        signals['VIX_Change'] = market_data['VIX_Change']
     
     # 7. Composite Warning Signal
-    warning_components = []
-    if 'Systemic_Score' in risk_signals.columns:
-        systemic_warning = risk_signals['Systemic_Score'] > risk_signals['Systemic_Score'].quantile(0.95)
-        warning_components.append(systemic_warning)
+    # 95th-percentile exceedances for every thresholded signal come from one
+    # partial sort of the stacked (T, N) matrix; HAR uses a fixed z > 2.
+    thresholded = [signals[c] for c in ('Systemic_Score', 'DCC_Corr') if c in signals]
+    warning = np.zeros(len(index), dtype=bool)
+    if thresholded:
+        stack = np.stack(thresholded, axis=1)
+        warning |= (stack > _column_quantiles(stack, 0.95)).any(axis=1)
     
-    if 'DCC_Corr' in risk_signals.columns:
-        dcc_warning = risk_signals['DCC_Corr'] > risk_signals['DCC_Corr'].quantile(0.95)
-        warning_components.append(dcc_warning)
+    if 'HAR_ExcessVol_Z' in signals:
+        warning |= signals['HAR_ExcessVol_Z'] > 2.0
     
-    if 'HAR_ExcessVol_Z' in risk_signals.columns:
-        har_warning = risk_signals['HAR_ExcessVol_Z'] > 2.0
-        warning_components.append(har_warning)
-    
-    if warning_components:
-        risk_signals['is_warning'] = pd.concat(warning_components, axis=1).any(axis=1).astype(int)
+    if thresholded or 'HAR_ExcessVol_Z' in signals:
+        signals['is_warning'] = warning.astype(int)
     
     # 8. Composite Risk Score (normalized combination)
     risk_components = []
     component_weights = {}
     
-    if 'Systemic_Score' in risk_signals.columns:
-        normalized_systemic = (risk_signals['Systemic_Score'] - risk_signals['Systemic_Score'].mean()) / risk_signals['Systemic_Score'].std()
-        risk_components.append(normalized_systemic)
+    if 'Systemic_Score' in signals:
+        risk_components.append(signals['Systemic_Score'])
         component_weights['systemic'] = 0.4
     
-    if 'Quantile_Signal' in risk_signals.columns:
-        normalized_quantile = (risk_signals['Quantile_Signal'] - risk_signals['Quantile_Signal'].mean()) / risk_signals['Quantile_Signal'].std()
-        risk_components.append(normalized_quantile)
+    if 'Quantile_Signal' in signals:
+        risk_components.append(signals['Quantile_Signal'])
         component_weights['quantile'] = 0.2
     
-    if 'DCC_Corr' in risk_signals.columns:
-        normalized_dcc = (risk_signals['DCC_Corr'] - risk_signals['DCC_Corr'].mean()) / risk_signals['DCC_Corr'].std()
-        risk_components.append(normalized_dcc)
+    if 'DCC_Corr' in signals:
+        risk_components.append(signals['DCC_Corr'])
         component_weights['dcc'] = 0.2
     
-    if 'HAR_ExcessVol_Z' in risk_signals.columns:
-        risk_components.append(risk_signals['HAR_ExcessVol_Z'])
+    if risk_components:
+        # Z-score every raw component in one (T, N) pass
+        comps = np.stack(risk_components, axis=1)
+        comps -= np.nanmean(comps, axis=0)
+        comps /= np.nanstd(comps, axis=0, ddof=1)
+    
+    if 'HAR_ExcessVol_Z' in signals:
+        # Already a z-score
+        har = signals['HAR_ExcessVol_Z'][:, None]
+        comps = np.hstack([comps, har]) if risk_components else har
         component_weights['har'] = 0.2
     
-    if risk_components:
-        # Weighted combination
-        total_weight = sum(component_weights.values())
-        weighted_components = []
-        
-        for i, component in enumerate(risk_components):
-            weight = list(component_weights.values())[i] / total_weight
-            weighted_components.append(component * weight)
-        
-        composite_score = pd.concat(weighted_components, axis=1).sum(axis=1)
-        risk_signals['Composite_Risk_Score'] = composite_score
+    if component_weights:
+        # Weighted combination; missing values contribute nothing, as with a
+        # skipna sum across the components
+        weights = np.fromiter(component_weights.values(), dtype=np.float64)
+        weights /= weights.sum()
+        signals['Composite_Risk_Score'] = np.where(np.isnan(comps), 0.0, comps) @ weights
     
-    return risk_signals.fillna(method='ffill').dropna()
+    # Columns arrive either as arrays already on `index` or as Series, which
+    # the constructor aligns, so the frame is assembled in one go
+    risk_signals = pd.DataFrame(signals, index=index)
+    
+    # Forward-fill and drop still-incomplete rows on the raw array, then
+    # restore the column dtypes (nothing is NaN any more)
+    values = _ffill(risk_signals.to_numpy(dtype=np.float64))
+    complete = ~np.isnan(values).any(axis=1)
+    return pd.DataFrame(
+        values[complete], index=risk_signals.index[complete], columns=risk_signals.columns
+    ).astype(risk_signals.dtypes.to_dict())
 
-@router.get("/visualization/systemic-risk")
+@router.get("/visualization/systemic-risk", response_class=ORJSONResponse)
 async def get_systemic_risk_visualization(force_refresh: bool = False):
     """
     Get focused systemic risk visualization data.
@@ -210,17 +248,17 @@ async def get_systemic_risk_visualization(force_refresh: bool = False):
             }
         }
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "data": visualization_data,
             "message": "Systemic risk visualization data generated successfully"
-        }
+        })
         
     except Exception as e:
         logger.error(f"Error generating systemic risk visualization: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/visualization/market-overview")
+@router.get("/visualization/market-overview", response_class=ORJSONResponse)
 async def get_market_overview_visualization(force_refresh: bool = False):
     """
     Get market overview visualization data including correlations and volatilities.
@@ -232,27 +270,38 @@ async def get_market_overview_visualization(force_refresh: bool = False):
             raise HTTPException(status_code=404, detail="No market data available")
         
         # Calculate correlation matrix for major assets
-        major_assets = ['SPY', 'HYG', 'LQD', 'XLF', 'XLK']
-        available_assets = [asset for asset in major_assets if asset in market_data.columns]
+        cols = frozenset(market_data.columns)
+        available_assets = [asset for asset in MAJOR_ASSETS if asset in cols]
+        
+        # Simple returns for all assets in one pass over a single array
+        prices = market_data[available_assets].to_numpy(dtype=np.float64)
+        asset_returns = np.full_like(prices, np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            np.divide(prices[1:], prices[:-1], out=asset_returns[1:])
+        asset_returns[1:] -= 1.0
+        # A zero price gives inf/NaN returns; leave those out like missing rows
+        missing = ~np.isfinite(asset_returns)
         
         if len(available_assets) >= 2:
-            asset_returns = market_data[available_assets].pct_change().dropna()
-            correlation_matrix = asset_returns.corr()
+            complete = asset_returns[~missing.any(axis=1)]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                corr = np.corrcoef(complete, rowvar=False)
+            correlation_matrix = pd.DataFrame(corr, index=available_assets, columns=available_assets)
             corr_data = visualization_service.generate_correlation_matrix_data(correlation_matrix)
         else:
             corr_data = {"error": "Insufficient assets for correlation matrix"}
         
         volatility_data = {}
-        for asset in available_assets:
-            returns = market_data[asset].pct_change().dropna()
-            vol_21d = returns.rolling(window=21).std()
+        for j, asset in enumerate(available_assets):
+            valid = ~missing[:, j]
+            vol_21d = pd.Series(rolling_std(asset_returns[valid, j], 21), index=market_data.index[valid])
             volatility_data[asset] = visualization_service._series_to_plotly_data(
                 vol_21d, 
                 f"{asset} 21d Vol", 
                 "orange"
             )
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "data": {
                 "correlation_matrix": corr_data,
@@ -267,7 +316,7 @@ async def get_market_overview_visualization(force_refresh: bool = False):
                 }
             },
             "message": "Market overview visualization data generated successfully"
-        }
+        })
         
     except Exception as e:
         logger.error(f"Error generating market overview visualization: {e}")
@@ -275,7 +324,85 @@ async def get_market_overview_visualization(force_refresh: bool = False):
     
 
 
-@router.get("/debug/signal-generation")
+@dataclass(frozen=True)
+class SignalSpec:
+    """One /debug/signal-generation check: the columns it needs and how to build it.
+
+    `compute(full_df, returns)` returns the signal as an array, or a status
+    string when there isn't enough data to build it.
+    """
+    name: str
+    cols: Tuple[str, ...]
+    compute: Callable[[pd.DataFrame, Dict[str, pd.Series]], Union[np.ndarray, str]]
+    missing_status: str
+    ok_status: str = "SUCCESS"
+    count_points: bool = True
+
+
+def _dcc_signal(full_df, returns):
+    # Both return series from one 2-column array; rows where both are missing
+    # drop out, the same rows the outer join of the two dropna()s lost
+    pair = full_df[['XLK', 'XLF']].to_numpy(dtype=np.float64)
+    rets = np.full_like(pair, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rets[1:] = pair[1:] / pair[:-1] - 1
+    observed = ~np.isnan(rets)
+    if not observed.all(axis=1).any():
+        return "NO_COMMON_DATES"
+    rets = rets[observed.any(axis=1)]
+    return rolling_corr(rets[:, 0], rets[:, 1], 21)
+
+
+def _har_signal(full_df, returns):
+    spy_returns = returns['SPY'].to_numpy(dtype=np.float64)
+    if len(spy_returns) <= 21:
+        return "INSUFFICIENT_DATA"
+    # The 21-day realized vol doubles as the monthly component
+    monthly_vol = rolling_std(spy_returns, 21)
+    weekly_vol = rolling_std(spy_returns, 5)
+    realized_vol = monthly_vol
+    
+    har_forecast = (weekly_vol + monthly_vol) / 2
+    excess_vol = realized_vol - har_forecast
+    if np.isnan(excess_vol).all():
+        return "NO_EXCESS_VOL_DATA"
+    return _zscore(excess_vol)
+
+
+def _quantile_signal(full_df, returns):
+    hyg_returns = returns['HYG'].to_numpy(dtype=np.float64)
+    if len(hyg_returns) <= 63:
+        return "INSUFFICIENT_DATA"
+    return rolling_quantile(hyg_returns, 63, 0.05)
+
+
+def _latest_column(col):
+    return lambda full_df, returns: full_df[col].to_numpy(dtype=np.float64)
+
+
+_SIGNAL_SPECS = (
+    SignalSpec("DCC_Correlation", ('XLK', 'XLF'), _dcc_signal, "MISSING_ETFS"),
+    SignalSpec("HAR_ExcessVol", ('SPY',), _har_signal, "MISSING_SPY"),
+    SignalSpec("Quantile_Signal", ('HYG',), _quantile_signal, "MISSING_HYG"),
+    SignalSpec("Macro_Oil", ('oil_return',), _latest_column('oil_return'), "MISSING", "PRESENT", False),
+    SignalSpec("Macro_FX", ('fx_change',), _latest_column('fx_change'), "MISSING", "PRESENT", False),
+)
+
+
+def _pack_signal_test(values: np.ndarray, ok_status: str, count_points: bool) -> dict:
+    """Status entry for a computed signal, keyed off its latest value."""
+    latest_val = values[-1] if len(values) else None
+    if latest_val is None or not np.isfinite(latest_val):
+        return {"status": "INVALID_VALUE", "value": str(latest_val)}
+    
+    packed = {"status": ok_status}
+    if count_points:
+        packed["data_points"] = int(np.count_nonzero(~np.isnan(values)))
+    packed["latest_value"] = float(latest_val)
+    return packed
+
+
+@router.get("/debug/signal-generation", response_class=ORJSONResponse)
 async def debug_signal_generation():
     """Debug endpoint to check why signals are null"""
     try:
@@ -293,131 +420,38 @@ async def debug_signal_generation():
         }
         
         # Check required columns for each signal
-        required_checks = {
-            "DCC_Correlation": ['XLK', 'XLF'],
-            "HAR_ExcessVol": ['SPY'],
-            "Quantile_Signal": ['HYG'],
-            "Macro_Oil": ['oil_return'],
-            "Macro_FX": ['fx_change']
-        }
-        
-        for signal_name, required_cols in required_checks.items():
-            missing = [col for col in required_cols if col not in full_df.columns]
-            result["required_columns_check"][signal_name] = {
-                "required": required_cols,
+        cols = frozenset(full_df.columns)
+        for spec in _SIGNAL_SPECS:
+            missing = [col for col in spec.cols if col not in cols]
+            result["required_columns_check"][spec.name] = {
+                "required": list(spec.cols),
                 "missing": missing,
-                "available": [col for col in required_cols if col in full_df.columns],
+                "available": [col for col in spec.cols if col in cols],
                 "status": "OK" if len(missing) == 0 else "MISSING_DATA"
             }
         
+        # Daily returns for each price column the tests use, computed once
+        returns = {
+            col: full_df[col].pct_change().dropna()
+            for col in ('SPY', 'HYG') if col in cols
+        }
+        
         # Test specific signal calculations with safe value extraction
         signal_tests = {}
-        
-        # Test DCC Correlation
-        if 'XLK' in full_df.columns and 'XLF' in full_df.columns:
-            xlk_returns = full_df['XLK'].pct_change().dropna()
-            xlf_returns = full_df['XLF'].pct_change().dropna()
-            common_idx = xlk_returns.index.intersection(xlf_returns.index)
-            if len(common_idx) > 0:
-                rolling_corr = xlk_returns.rolling(window=21).corr(xlf_returns)
-                latest_val = rolling_corr.iloc[-1] if not rolling_corr.empty else None
-                # Safe value extraction
-                if latest_val is not None and not pd.isna(latest_val) and np.isfinite(latest_val):
-                    signal_tests["DCC_Correlation"] = {
-                        "status": "SUCCESS",
-                        "data_points": len(rolling_corr.dropna()),
-                        "latest_value": float(latest_val)
-                    }
-                else:
-                    signal_tests["DCC_Correlation"] = {"status": "INVALID_VALUE", "value": str(latest_val)}
+        for spec in _SIGNAL_SPECS:
+            if result["required_columns_check"][spec.name]["missing"]:
+                signal_tests[spec.name] = {"status": spec.missing_status}
+                continue
+            values = spec.compute(full_df, returns)
+            if isinstance(values, str):
+                signal_tests[spec.name] = {"status": values}
             else:
-                signal_tests["DCC_Correlation"] = {"status": "NO_COMMON_DATES"}
-        else:
-            signal_tests["DCC_Correlation"] = {"status": "MISSING_ETFS"}
-        
-        # Test HAR Excess Vol
-        if 'SPY' in full_df.columns:
-            spy_returns = full_df['SPY'].pct_change().dropna()
-            if len(spy_returns) > 21:
-                realized_vol = spy_returns.rolling(window=21).std()
-                daily_vol = spy_returns.rolling(window=1).std()
-                weekly_vol = spy_returns.rolling(window=5).std()
-                monthly_vol = spy_returns.rolling(window=21).std()
-                
-                har_forecast = (daily_vol + weekly_vol + monthly_vol) / 3
-                excess_vol = realized_vol - har_forecast
-                
-                if not excess_vol.dropna().empty:
-                    har_z = (excess_vol - excess_vol.mean()) / excess_vol.std()
-                    latest_val = har_z.iloc[-1] if not har_z.empty else None
-                    if latest_val is not None and not pd.isna(latest_val) and np.isfinite(latest_val):
-                        signal_tests["HAR_ExcessVol"] = {
-                            "status": "SUCCESS", 
-                            "data_points": len(har_z.dropna()),
-                            "latest_value": float(latest_val)
-                        }
-                    else:
-                        signal_tests["HAR_ExcessVol"] = {"status": "INVALID_VALUE", "value": str(latest_val)}
-                else:
-                    signal_tests["HAR_ExcessVol"] = {"status": "NO_EXCESS_VOL_DATA"}
-            else:
-                signal_tests["HAR_ExcessVol"] = {"status": "INSUFFICIENT_DATA"}
-        else:
-            signal_tests["HAR_ExcessVol"] = {"status": "MISSING_SPY"}
-        
-        # Test Quantile Signal
-        if 'HYG' in full_df.columns:
-            hyg_returns = full_df['HYG'].pct_change().dropna()
-            if len(hyg_returns) > 63:
-                quantile_signal = hyg_returns.rolling(window=63).quantile(0.05)
-                latest_val = quantile_signal.iloc[-1] if not quantile_signal.empty else None
-                if latest_val is not None and not pd.isna(latest_val) and np.isfinite(latest_val):
-                    signal_tests["Quantile_Signal"] = {
-                        "status": "SUCCESS",
-                        "data_points": len(quantile_signal.dropna()),
-                        "latest_value": float(latest_val)
-                    }
-                else:
-                    signal_tests["Quantile_Signal"] = {"status": "INVALID_VALUE", "value": str(latest_val)}
-            else:
-                signal_tests["Quantile_Signal"] = {"status": "INSUFFICIENT_DATA"}
-        else:
-            signal_tests["Quantile_Signal"] = {"status": "MISSING_HYG"}
-        
-        # Test Macro Signals
-        if 'oil_return' in full_df.columns:
-            oil_val = full_df['oil_return'].iloc[-1] if not full_df['oil_return'].empty else None
-            if oil_val is not None and not pd.isna(oil_val) and np.isfinite(oil_val):
-                signal_tests["Macro_Oil"] = {
-                    "status": "PRESENT",
-                    "latest_value": float(oil_val)
-                }
-            else:
-                signal_tests["Macro_Oil"] = {"status": "INVALID_VALUE", "value": str(oil_val)}
-        else:
-            signal_tests["Macro_Oil"] = {"status": "MISSING"}
-        
-        if 'fx_change' in full_df.columns:
-            fx_val = full_df['fx_change'].iloc[-1] if not full_df['fx_change'].empty else None
-            if fx_val is not None and not pd.isna(fx_val) and np.isfinite(fx_val):
-                signal_tests["Macro_FX"] = {
-                    "status": "PRESENT", 
-                    "latest_value": float(fx_val)
-                }
-            else:
-                signal_tests["Macro_FX"] = {"status": "INVALID_VALUE", "value": str(fx_val)}
-        else:
-            signal_tests["Macro_FX"] = {"status": "MISSING"}
+                signal_tests[spec.name] = _pack_signal_test(values, spec.ok_status, spec.count_points)
         
         result["signal_tests"] = signal_tests
         
-        # Use FastAPI's built-in JSON handling with our custom serializer
-        from fastapi.encoders import jsonable_encoder
-        return jsonable_encoder(result, custom_encoder={
-            float: lambda x: x if not np.isnan(x) and np.isfinite(x) else None,
-            np.float64: lambda x: float(x) if not np.isnan(x) and np.isfinite(x) else None,
-            pd.Timestamp: lambda x: x.isoformat()
-        })
+        # orjson maps NaN/inf to null and encodes numpy/pandas values directly
+        return ORJSONResponse(result)
         
     except Exception as e:
         return {"error": str(e)}
\ No newline at end of file
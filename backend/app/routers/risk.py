@@ -1,25 +1,279 @@
-from fastapi import APIRouter, HTTPException, WebSocket, Query
+from fastapi import APIRouter, HTTPException, WebSocket, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.future import select
 from app.core.db import AsyncSessionLocal
 from app.models.risk import RiskSnapshot, CreditSignalSnapshot, SystemicRiskSnapshot
 from app.core.historical_risk import get_historical_risk_by_range
 from app.services.data_pipeline import get_credit_signals, get_full_market_dataset
-from app.core.cache import get_cached_data, set_cached_data
+from app.core.cache import LocalTTLCache, get_cached_bytes, set_cached_bytes
+from app.core.responses import ORJSONResponse, dumps
 from app.core.db_utils import save_credit_snapshot
 from app.services.systemic_risk import compute_systemic_risk
 from app.services.risk_engine import RiskEngine
 import pandas as pd
+import numpy as np
 import json
+import orjson
 import anyio
+import asyncio
 import logging
 from datetime import datetime, timedelta
+from typing import Dict
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="", tags=["Risk Analytics"])
 engine = RiskEngine()
 
+REGIME_INTERPRETATIONS = {
+    "RED": "High systemic risk detected. Monitor markets closely.",
+    "YELLOW": "Elevated risk levels. Increased vigilance recommended.",
+    "GREEN": "Normal market conditions. Standard monitoring procedures.",
+}
+# Indexed by the regime codes from _classify
+REGIMES = np.array(["GREEN", "YELLOW", "RED"], dtype=object)
+INTERPRETATIONS = np.array([REGIME_INTERPRETATIONS[r] for r in REGIMES], dtype=object)
 
-@router.get("/history")
+# Optional systemic_df signal columns and the /history field each maps to
+SIGNAL_MAPPING = {
+    "Quantile_Signal": "quantile_signal",
+    "DCC_Corr": "dcc_correlation",
+    "HAR_ExcessVol_Z": "har_excess_vol",
+    "Credit_Spread_Change": "credit_spread_change",
+    "VIX_Change": "vix_change",
+    "Composite_Risk_Score": "composite_risk_score",
+}
+
+# Encoded /history bodies for the hottest ranges, in front of Redis
+_history_bodies = LocalTTLCache(maxsize=64, ttl=300)
+
+# Recent compute_full_risk results by (days, start_date, end_date)
+_full_risk_results = LocalTTLCache(maxsize=32, ttl=5)
+_full_risk_inflight: Dict[tuple, asyncio.Future] = {}
+
+# Rows per chunk for /history/stream
+HISTORY_STREAM_CHUNK = 256
+
+# Decimal places kept for the per-day /history scores. The dashboard never
+# shows more, and the shorter numbers cut both the JSON size and the
+# float-printing cost.
+HISTORY_DECIMALS = 6
+
+
+def _wire(values: np.ndarray) -> list:
+    return np.round(values, HISTORY_DECIMALS).tolist()
+
+
+def _classify(systemic: np.ndarray, mean: float, std: float, high: float, medium: float):
+    """Regime codes (0 GREEN, 1 YELLOW, 2 RED), z-scores and percentiles.
+
+    Works in place on as few temporaries as possible; NaN scores land in
+    GREEN with a 0 percentile.
+    """
+    codes = (systemic >= medium).view(np.int8)
+    codes[systemic >= high] = 2
+
+    if std > 0:
+        z = systemic - mean
+        z /= std
+    else:
+        z = np.zeros(len(systemic))
+
+    pct = z + 2
+    pct /= 4
+    np.clip(pct, 0, 1, out=pct)
+    pct[np.isnan(pct)] = 0.0
+    return codes, z, pct
+
+
+def _float_column(df: pd.DataFrame, column: str) -> np.ndarray:
+    # One bulk conversion per column; nullable dtypes come back with NaN for NA
+    return df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _thresholds(current_metrics: dict):
+    systemic_mean = current_metrics.get("systemic_mean", 0.0)
+    systemic_std = current_metrics.get("systemic_std", 1.0)
+    return systemic_mean + systemic_std, systemic_mean + 0.5 * systemic_std
+
+
+def _history_points(systemic_df: pd.DataFrame, current_metrics: dict) -> list:
+    """/history data points for the rows of `systemic_df`.
+
+    Every field depends only on its own row and the current metrics, so a
+    slice of the frame yields exactly that slice of the points.
+    """
+    current_systemic = current_metrics.get("systemic_risk", 0.0)
+    systemic_mean = current_metrics.get("systemic_mean", 0.0)
+    systemic_std = current_metrics.get("systemic_std", 1.0)
+    high_threshold, medium_threshold = _thresholds(current_metrics)
+    
+    # Whole-column computations; rows are only assembled at the end
+    systemic = _float_column(systemic_df, "Systemic")
+    pca = _float_column(systemic_df, "PCA") if "PCA" in systemic_df.columns else systemic * 0.6
+    credit = _float_column(systemic_df, "Credit") if "Credit" in systemic_df.columns else systemic * 0.4
+    
+    codes, z_scores, percentiles = _classify(
+        systemic, systemic_mean, systemic_std, high_threshold, medium_threshold
+    )
+    
+    # Add all available risk signals, resolved once to (field, array) pairs
+    signals = [
+        (api_col, _float_column(systemic_df, df_col))
+        for df_col, api_col in SIGNAL_MAPPING.items() if df_col in systemic_df.columns
+    ]
+    
+    rows = zip(
+        # One C-level strftime over the whole index
+        systemic_df.index.strftime('%Y-%m-%d').tolist(),
+        _wire(systemic),
+        _wire(pca),
+        _wire(credit),
+        REGIMES[codes].tolist(),
+        INTERPRETATIONS[codes].tolist(),
+        z_scores.tolist(),
+        percentiles.tolist(),
+        _wire(systemic - current_systemic),
+        _wire(systemic - pca - credit),
+    )
+    
+    # Enhanced data point with all available signals
+    result = [
+        {
+            "date": date,
+            "systemic_risk": systemic_risk,
+            "systemic_risk_score": systemic_risk,
+            "pca_signal_score": pca_component,
+            "credit_signal_score": credit_component,
+            "market_regime": regime,
+            "risk_interpretation": interpretation,
+            "z_score": z_score,
+            "percentile": percentile,
+            "relative_to_current": relative,
+            "components": {
+                "pca_contribution": pca_component,
+                "credit_contribution": credit_component,
+                "other_contribution": other
+            }
+        }
+        for date, systemic_risk, pca_component, credit_component, regime, interpretation, z_score, percentile, relative, other in rows
+    ]
+    
+    # Signals go in column by column, only at the rows where they are
+    # present (notna mask computed once per column)
+    for api_col, values in signals:
+        present = np.flatnonzero(~np.isnan(values))
+        for i, value in zip(present.tolist(), _wire(values[present])):
+            result[i][api_col] = value
+    
+    # Add warning signal if available
+    if "is_warning" in systemic_df.columns:
+        for data_point, warning in zip(result, systemic_df["is_warning"].tolist()):
+            data_point["is_warning"] = bool(warning)
+    
+    return result
+
+
+def _history_summary(systemic_df: pd.DataFrame, current_metrics: dict, date_range=None) -> dict:
+    """/history summary. date_range is the (first, last) formatted date when
+    the caller already has the points' dates; otherwise only those two index
+    entries are formatted."""
+    high_threshold, medium_threshold = _thresholds(current_metrics)
+    
+    # Summary stats off the float array, skipping NaN like the Series methods
+    systemic = _float_column(systemic_df, "Systemic")
+    observed = systemic[~np.isnan(systemic)]
+    if len(observed):
+        period_stats = [
+            observed.mean(),
+            observed.std(ddof=1) if len(observed) > 1 else np.nan,
+            observed.min(),
+            observed.max(),
+        ]
+    else:
+        period_stats = [np.nan] * 4
+    period_stats = [float(v) for v in period_stats]
+    if date_range is None:
+        date_range = systemic_df.index[[0, -1]].strftime('%Y-%m-%d')
+    start, end = date_range
+    
+    # Enhanced summary with comprehensive metrics
+    return {
+        "current_risk": current_metrics.get("systemic_risk", 0.0),
+        "period_mean": period_stats[0],
+        "period_std": period_stats[1],
+        "period_min": period_stats[2],
+        "period_max": period_stats[3],
+        "data_points": len(systemic_df),
+        "date_range": {
+            "start": start,
+            "end": end
+        },
+        "risk_distribution": {
+            "high_threshold": float(high_threshold),
+            "medium_threshold": float(medium_threshold),
+            "current_regime": current_metrics.get("risk_level", "unknown")
+        },
+        "signal_summary": {
+            "available_signals": list(systemic_df.columns),
+            "current_dcc_correlation": current_metrics.get("dcc_correlation"),
+            "current_quantile_signal": current_metrics.get("quantile_signal"),
+            "current_har_excess_vol": current_metrics.get("har_excess_vol"),
+            "current_composite_score": current_metrics.get("composite_risk_score")
+        }
+    }
+
+
+async def _compute_full_risk(days, start_date, end_date, force_refresh: bool = False):
+    """engine.compute_full_risk, with non-forced results shared for a few
+    seconds so a burst of dashboard refreshes computes the range once.
+
+    Single-flight: callers arriving while the same range is being computed
+    wait for that computation instead of starting their own.
+    """
+    key = (days, start_date, end_date)
+    if not force_refresh:
+        result = _full_risk_results.get(key)
+        if result is not None:
+            return result
+
+    task = None if force_refresh else _full_risk_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(engine.compute_full_risk(
+            force_refresh=force_refresh, days=days, start_date=start_date, end_date=end_date
+        ))
+        _full_risk_inflight[key] = task
+        task.add_done_callback(lambda done: _full_risk_finished(key, done))
+    # Shielded so one caller going away doesn't cancel it for the others
+    return await asyncio.shield(task)
+
+
+def _full_risk_finished(key, task: asyncio.Future):
+    if _full_risk_inflight.get(key) is task:
+        del _full_risk_inflight[key]
+    # A forced recompute also refreshes what later requests share
+    if not task.cancelled() and task.exception() is None:
+        _full_risk_results.set(key, task.result())
+
+
+def _history_points_and_summary(systemic_df: pd.DataFrame, current_metrics: dict):
+    points = _history_points(systemic_df, current_metrics)
+    # The summary's date range reuses the points' formatted dates
+    date_range = (points[0]["date"], points[-1]["date"])
+    return points, _history_summary(systemic_df, current_metrics, date_range)
+
+
+def _history_cache_key(days, start_date, end_date):
+    """Cache key for a /history range, and the days to use (180 by default)."""
+    if days:
+        return f"risk_history_days_{days}", days
+    if start_date and end_date:
+        return f"risk_history_range_{start_date}_{end_date}", days
+    if start_date:
+        return f"risk_history_from_{start_date}", days
+    return "risk_history_days_180", 180
+
+
+@router.get("/history", response_class=ORJSONResponse)
 async def get_risk_history(
     days: int = Query(None, ge=1, le=3650, description="Number of days from today"),
     start_date: str = Query(None, description="Start date (YYYY-MM-DD)"),
@@ -29,36 +283,30 @@ async def get_risk_history(
     """
     Get REAL historical systemic risk data from RiskEngine computations with comprehensive metrics.
     """
-    if days:
-        cache_key = f"risk_history_days_{days}"
-    elif start_date and end_date:
-        cache_key = f"risk_history_range_{start_date}_{end_date}"
-    elif start_date:
-        cache_key = f"risk_history_from_{start_date}"
-    else:
-        days = 180
-        cache_key = f"risk_history_days_180"
+    cache_key, days = _history_cache_key(days, start_date, end_date)
 
+    # The encoded response body is cached, so a hit is served without
+    # decoding or re-encoding anything
+    body_key = f"{cache_key}:json"
     if use_cache:
-        cached_data = await get_cached_data(cache_key)
-        if cached_data is not None:
+        cached_body = _history_bodies.get(body_key)
+        if cached_body is None:
+            cached_body = await get_cached_bytes(body_key)
+            if cached_body is not None:
+                _history_bodies.set(body_key, cached_body)
+        if cached_body is not None:
             logger.info(f"Cache hit for {cache_key}")
-            return cached_data
+            return Response(content=cached_body, media_type="application/json")
 
     try:
-        full_result = await engine.compute_full_risk(
-            force_refresh=not use_cache,
-            days=days,
-            start_date=start_date,
-            end_date=end_date
-        )
+        full_result = await _compute_full_risk(days, start_date, end_date, force_refresh=not use_cache)
         
         systemic_df = full_result.get("systemic_df")
         metrics = full_result.get("metrics", {})
         
         if systemic_df is None or systemic_df.empty or "Systemic" not in systemic_df.columns:
             logger.error("RiskEngine returned empty systemic data")
-            return {
+            return ORJSONResponse({
                 "data": [],
                 "summary": {},
                 "current_metrics": metrics,
@@ -67,102 +315,16 @@ async def get_risk_history(
                     "cache_key": cache_key,
                     "cached": False
                 }
-            }
+            })
         
         logger.info(f"Already filtered dataset: {len(systemic_df)} rows from {systemic_df.index[0]} to {systemic_df.index[-1]}")
         
         current_metrics = metrics
-        current_systemic = current_metrics.get("systemic_risk", 0.0)
-        systemic_mean = current_metrics.get("systemic_mean", 0.0)
-        systemic_std = current_metrics.get("systemic_std", 1.0)
-        
-        high_threshold = systemic_mean + systemic_std
-        medium_threshold = systemic_mean + 0.5 * systemic_std
-        
-        result = []
-        for date, row in systemic_df.iterrows():
-            systemic_risk = row["Systemic"]
-            
-            if systemic_risk >= high_threshold:
-                regime = "RED"
-                interpretation = "High systemic risk detected. Monitor markets closely."
-            elif systemic_risk >= medium_threshold:
-                regime = "YELLOW" 
-                interpretation = "Elevated risk levels. Increased vigilance recommended."
-            else:
-                regime = "GREEN"
-                interpretation = "Normal market conditions. Standard monitoring procedures."
-            
-            pca_component = row.get("PCA", systemic_risk * 0.6)
-            credit_component = row.get("Credit", systemic_risk * 0.4)
-            
-            z_score = (systemic_risk - systemic_mean) / systemic_std if systemic_std > 0 else 0
-            percentile = min(max(0, (z_score + 2) / 4), 1)
-            
-            # Enhanced data point with all available signals
-            data_point = {
-                "date": date.strftime('%Y-%m-%d'),
-                "systemic_risk": float(systemic_risk),
-                "systemic_risk_score": float(systemic_risk),
-                "pca_signal_score": float(pca_component),
-                "credit_signal_score": float(credit_component),
-                "market_regime": regime,
-                "risk_interpretation": interpretation,
-                "z_score": float(z_score),
-                "percentile": float(percentile),
-                "relative_to_current": float(systemic_risk - current_systemic),
-                "components": {
-                    "pca_contribution": float(pca_component),
-                    "credit_contribution": float(credit_component),
-                    "other_contribution": float(systemic_risk - pca_component - credit_component)
-                }
-            }
-            
-            # Add all available risk signals
-            signal_mapping = {
-                "Quantile_Signal": "quantile_signal",
-                "DCC_Corr": "dcc_correlation", 
-                "HAR_ExcessVol_Z": "har_excess_vol",
-                "Credit_Spread_Change": "credit_spread_change",
-                "VIX_Change": "vix_change",
-                "Composite_Risk_Score": "composite_risk_score"
-            }
-            
-            for df_col, api_col in signal_mapping.items():
-                if df_col in row and pd.notna(row[df_col]):
-                    data_point[api_col] = float(row[df_col])
-            
-            # Add warning signal if available
-            if "is_warning" in row:
-                data_point["is_warning"] = bool(row["is_warning"])
-            
-            result.append(data_point)
-        
-        # Enhanced summary with comprehensive metrics
-        summary = {
-            "current_risk": current_systemic,
-            "period_mean": float(systemic_df["Systemic"].mean()),
-            "period_std": float(systemic_df["Systemic"].std()),
-            "period_min": float(systemic_df["Systemic"].min()),
-            "period_max": float(systemic_df["Systemic"].max()),
-            "data_points": len(systemic_df),
-            "date_range": {
-                "start": systemic_df.index[0].strftime('%Y-%m-%d'),
-                "end": systemic_df.index[-1].strftime('%Y-%m-%d')
-            },
-            "risk_distribution": {
-                "high_threshold": float(high_threshold),
-                "medium_threshold": float(medium_threshold),
-                "current_regime": current_metrics.get("risk_level", "unknown")
-            },
-            "signal_summary": {
-                "available_signals": list(systemic_df.columns),
-                "current_dcc_correlation": current_metrics.get("dcc_correlation"),
-                "current_quantile_signal": current_metrics.get("quantile_signal"),
-                "current_har_excess_vol": current_metrics.get("har_excess_vol"),
-                "current_composite_score": current_metrics.get("composite_risk_score")
-            }
-        }
+        # Building the points for a multi-year range is CPU-bound; keep it
+        # (and the encoding below) off the event loop
+        result, summary = await anyio.to_thread.run_sync(
+            _history_points_and_summary, systemic_df, current_metrics
+        )
         
         response = {
             "data": result,
@@ -181,21 +343,24 @@ async def get_risk_history(
         logger.info(f"Returning {len(result)} risk data points with {len(systemic_df.columns)} signals")
         
         if use_cache:
-            await set_cached_data(cache_key, response, expire_seconds=3600)
             response["metadata"]["cached"] = True
-
-        return response
+        body = await anyio.to_thread.run_sync(dumps, response)
+        if use_cache:
+            await set_cached_bytes(body_key, body, expire_seconds=3600)
+            _history_bodies.set(body_key, body)
+        return Response(content=body, media_type="application/json")
 
     except Exception as e:
         logger.error(f"Error getting risk history from RiskEngine: {e}")
         
         try:
-            cached_fallback = await get_cached_data(cache_key)
-            if cached_fallback:
+            cached_body = await get_cached_bytes(body_key)
+            if cached_body:
+                cached_fallback = orjson.loads(cached_body)
                 logger.info("Using cached data as fallback due to computation error")
                 cached_fallback["metadata"]["fallback"] = True
                 cached_fallback["metadata"]["error"] = str(e)
-                return cached_fallback
+                return ORJSONResponse(cached_fallback)
         except:
             pass
             
@@ -203,3 +368,58 @@ async def get_risk_history(
             status_code=500, 
             detail=f"Error getting risk history: {e}"
         )
+
+
+@router.get("/history/stream")
+async def stream_risk_history(
+    days: int = Query(None, ge=1, le=3650, description="Number of days from today"),
+    start_date: str = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: str = Query(None, description="End date (YYYY-MM-DD)"),
+    use_cache: bool = Query(True, description="Use cached risk computations")
+):
+    """
+    /history as NDJSON: one header line with summary, current metrics and
+    metadata, then one data point per line. Points are built and encoded
+    HISTORY_STREAM_CHUNK rows at a time, so long ranges never hold the full
+    list or the full encoded body in memory.
+    """
+    cache_key, days = _history_cache_key(days, start_date, end_date)
+    try:
+        full_result = await _compute_full_risk(days, start_date, end_date, force_refresh=not use_cache)
+    except Exception as e:
+        logger.error(f"Error streaming risk history from RiskEngine: {e}")
+        raise HTTPException(status_code=500, detail=f"Error getting risk history: {e}")
+    
+    systemic_df = full_result.get("systemic_df")
+    current_metrics = full_result.get("metrics", {})
+    
+    if systemic_df is None or systemic_df.empty or "Systemic" not in systemic_df.columns:
+        header = {
+            "summary": {},
+            "current_metrics": current_metrics,
+            "metadata": {"error": "No systemic data available", "cache_key": cache_key, "data_points": 0}
+        }
+        return StreamingResponse(iter([dumps(header) + b"\n"]), media_type="application/x-ndjson")
+    
+    header = {
+        "summary": _history_summary(systemic_df, current_metrics),
+        "current_metrics": current_metrics,
+        "metadata": {
+            "computation_time": current_metrics.get("computation_time"),
+            "source": current_metrics.get("source", "risk_engine"),
+            "cache_key": cache_key,
+            "data_points": len(systemic_df),
+            "available_signals_count": len(systemic_df.columns),
+            "computation_duration": current_metrics.get("computation_duration", 0)
+        }
+    }
+    
+    def lines():
+        # A plain generator: Starlette iterates it in a worker thread, so
+        # building the points stays off the event loop
+        yield dumps(header) + b"\n"
+        for start in range(0, len(systemic_df), HISTORY_STREAM_CHUNK):
+            points = _history_points(systemic_df.iloc[start:start + HISTORY_STREAM_CHUNK], current_metrics)
+            yield b"".join([dumps(point) + b"\n" for point in points])
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
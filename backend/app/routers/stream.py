@@ -1,6 +1,8 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from starlette.websockets import WebSocketState
 from app.services.realtime_service import realtime_service
+from app.core.responses import dumps, packb
+from typing import Optional, Set
 import asyncio
 import logging
 from datetime import datetime
@@ -8,55 +10,143 @@ from datetime import datetime
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["WebSocket Streams"])
 
+STREAM_INTERVAL = 10  # seconds between updates, with FULL data
+# Clients offering this WebSocket subprotocol get binary MessagePack frames;
+# everyone else gets JSON text frames
+MSGPACK_SUBPROTOCOL = "msgpack"
+
+
+class StreamFrame:
+    """One update, encoded as JSON text up front and as MessagePack only once
+    a msgpack client asks for it; either encoding happens at most once."""
+
+    __slots__ = ("message", "text", "_packed")
+
+    def __init__(self, message: dict):
+        self.message = message
+        # Text frames, as send_json sent; orjson handles numpy values and NaN
+        self.text = dumps(message).decode()
+        self._packed: Optional[bytes] = None
+
+    @property
+    def packed(self) -> bytes:
+        if self._packed is None:
+            self._packed = packb(self.message)
+        return self._packed
+
+
+class RiskStreamHub:
+    """Single producer for /ws/risk: metrics are fetched and encoded once per
+    tick and fanned out to every connected socket, however many there are."""
+
+    def __init__(self, interval: int = STREAM_INTERVAL):
+        self.interval = interval
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._latest: Optional[StreamFrame] = None
+        # Metrics snapshot _latest was encoded from; the service hands back
+        # the same dict until it recomputes, so unchanged ticks skip encoding
+        self._latest_source: Optional[dict] = None
+        self._producer: Optional[asyncio.Task] = None
+
+    def subscribe(self) -> asyncio.Queue:
+        # Size 1: a slow client only ever has the newest update waiting
+        queue = asyncio.Queue(maxsize=1)
+        if self._latest is not None:
+            queue.put_nowait(self._latest)
+        self._subscribers.add(queue)
+
+        if self._producer is None or self._producer.done():
+            self._producer = asyncio.create_task(self._produce())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def _publish(self, frame: StreamFrame):
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(frame)
+
+    async def _produce(self):
+        try:
+            # Stops on its own once the last client has gone
+            while self._subscribers:
+                # Only producing the payload can fail upstream; that becomes
+                # an error frame and the stream carries on. Client sends and
+                # disconnects are handled per socket in risk_stream.
+                try:
+                    metrics = await realtime_service.get_current_metrics()
+                    if metrics is self._latest_source:
+                        frame = self._latest
+                    else:
+                        frame = StreamFrame(self._envelope(metrics))
+                except Exception as e:
+                    logger.warning(f"Risk stream inner error: {e}")
+                    self._publish(StreamFrame(self._error_message(e)))
+                else:
+                    self._latest, self._latest_source = frame, metrics
+                    self._publish(frame)
+                    logger.debug(f"Sent COMPREHENSIVE WebSocket update to {len(self._subscribers)} clients: {metrics.get('timestamp')}")
+
+                await asyncio.sleep(self.interval)
+        finally:
+            if not self._subscribers:
+                self._latest = self._latest_source = None
+
+    @staticmethod
+    def _envelope(metrics: dict) -> dict:
+        return {
+            **metrics,
+            "_metadata": {
+                "type": "comprehensive_risk_update",
+                "stream": "real_time",
+                "timestamp": metrics.get("timestamp"),
+                "data_points": metrics.get("data_points", 0),
+                "signals_count": len(metrics.get("available_signals", []))
+            }
+        }
+
+    @staticmethod
+    def _error_message(error: Exception) -> dict:
+        return {
+            "error": str(error),
+            "_metadata": {
+                "type": "error",
+                "timestamp": datetime.utcnow().isoformat() + "Z"
+            }
+        }
+
+
+risk_stream_hub = RiskStreamHub()
+
+
 @router.websocket("/ws/risk")
 async def risk_stream(websocket: WebSocket):
-    await websocket.accept()
-    logger.info("WebSocket risk stream connected")
-    
+    use_msgpack = MSGPACK_SUBPROTOCOL in websocket.scope.get("subprotocols", [])
+    await websocket.accept(subprotocol=MSGPACK_SUBPROTOCOL if use_msgpack else None)
+    logger.info(f"WebSocket risk stream connected ({'msgpack' if use_msgpack else 'json'})")
+    queue = risk_stream_hub.subscribe()
+
     try:
         while True:
+            frame = await queue.get()
+
             # Stop sending if the socket is closed
             if websocket.application_state != WebSocketState.CONNECTED:
                 logger.warning("WebSocket closed — stopping stream.")
                 break
 
-            try:
-                metrics = await realtime_service.get_current_metrics()
-                
-                enhanced_metrics = {
-                    **metrics,
-                    "_metadata": {
-                        "type": "comprehensive_risk_update",
-                        "stream": "real_time",
-                        "timestamp": metrics.get("timestamp"),
-                        "data_points": metrics.get("data_points", 0),
-                        "signals_count": len(metrics.get("available_signals", []))
-                    }
-                }
-                
-                await websocket.send_json(enhanced_metrics)
-                logger.debug(f"Sent COMPREHENSIVE WebSocket update: {enhanced_metrics['timestamp']}")
-                
-            except Exception as e:
-                logger.warning(f"Risk stream inner error: {e}")
-                # Send error to client but don't break connection
-                try:
-                    await websocket.send_json({
-                        "error": str(e),
-                        "_metadata": {
-                            "type": "error",
-                            "timestamp": datetime.utcnow().isoformat() + "Z"
-                        }
-                    })
-                except:
-                    pass
-
-            await asyncio.sleep(10)  # 10-second intervals with FULL data
+            if use_msgpack:
+                await websocket.send_bytes(frame.packed)
+            else:
+                await websocket.send_text(frame.text)
 
     except WebSocketDisconnect:
         logger.info("WebSocket risk stream client disconnected")
     except Exception as e:
         logger.error(f"WebSocket risk stream error: {e}")
     finally:
+        risk_stream_hub.unsubscribe(queue)
         if websocket.application_state == WebSocketState.CONNECTED:
-            await websocket.close()
\ No newline at end of file
+            await websocket.close()
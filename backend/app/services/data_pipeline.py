@@ -2,7 +2,8 @@ import pandas as pd
 import numpy as np
 import yfinance as yf
 from fredapi import Fred
-from app.core.cache import get_cached_data, set_cached_data
+from app.core.cache import LocalTTLCache, get_cached_data, set_cached_data, set_cached_many
+from app.core.analytics.rolling import rolling_corr, rolling_mean, rolling_std
 import os
 import asyncio
 from datetime import datetime, timedelta
@@ -18,6 +19,36 @@ logger = logging.getLogger(__name__)
 
 
 fred = None
+# Decoded cache entries, so the nested calls in one refresh (full dataset ->
+# credit signals -> oil/FX) and bursts of requests don't each hit Redis
+_local_frames = LocalTTLCache(maxsize=16, ttl=30)
+
+START_DATE = '2003-01-01'
+OIL_TICKERS = ['CL=F', 'USO', 'BZ=F']  # WTI, US Oil Fund, Brent
+FX_TICKERS = ['DX-Y.NYB', 'EURUSD=X', 'JPY=X', 'GBPUSD=X']  # DXY, EUR/USD, USD/JPY, GBP/USD
+CREDIT_TICKERS = ['HYG', 'TLT', 'LQD', 'SPY']
+SECTOR_TICKERS = ["XLB", "XLE", "XLF", "XLI", "XLK", "XLP", "XLRE", "XLU", "XLV", "XLY", "SPY"]
+# Economic indicators merged into the credit signals as daily % changes
+ECON_SERIES = {
+    'HY_Spread': 'BAMLH0A0HYM2',
+    'IG_Spread': 'BAMLC0A0CM',
+    'VIX': 'VIXCLS',
+    'Unemployment': 'UNRATE',
+    'Term_Spread': 'T10Y2Y'
+}
+ALL_TICKERS = list(dict.fromkeys(CREDIT_TICKERS + OIL_TICKERS + FX_TICKERS + SECTOR_TICKERS))
+
+# Cache lifetimes (seconds) per source. Prices are daily closes, so the
+# price-derived frames and the merged dataset keep an hour; FRED publishes
+# at most once a day.
+CACHE_TTL = {
+    'oil_data': 3600,
+    'fx_data': 3600,
+    'credit_signals': 3600,
+    'sector_data': 3600,
+    'full_market_data': 3600,
+    'fred_macro': 86400,
+}
 
 def initialize_fred_client():
     global fred
@@ -61,31 +92,132 @@ def validate_data_quality(df: pd.DataFrame, min_rows: int = 100, max_null_pct: f
         validation['is_valid'] = False
         validation['issues'].append(f"Insufficient data: only {len(df)} rows, minimum {min_rows} required")
     
-    # Check for null values
-    null_pct = df.isnull().sum().sum() / (len(df) * len(df.columns))
+    # Check for null values; cached frames are usually clean, so only count
+    # once any() says there is something to count
+    nulls = df.isna().to_numpy()
+    null_pct = np.count_nonzero(nulls) / nulls.size if nulls.any() else 0.0
     validation['summary']['null_percentage'] = null_pct
     
     if null_pct > max_null_pct:
         validation['issues'].append(f"High null percentage: {null_pct:.2%} exceeds threshold {max_null_pct:.2%}")
     
     # Check for infinite values
-    inf_count = np.isinf(df.select_dtypes(include=[np.number])).sum().sum()
+    infs = np.isinf(df.select_dtypes(include=[np.number]).to_numpy(dtype=np.float64, na_value=np.nan))
+    inf_count = int(np.count_nonzero(infs)) if infs.any() else 0
     validation['summary']['infinite_values'] = inf_count
     if inf_count > 0:
         validation['issues'].append(f"Found {inf_count} infinite values")
     
     return validation
 
-async def get_oil_data(force_refresh: bool = False) -> pd.DataFrame:
+def _frame_entry(df: pd.DataFrame, min_rows: int = 100) -> Dict[str, Any]:
+    """Cache payload for a frame: the frame plus its validation, computed once
+    here so cache hits don't rescan it. The frame is stored at full float64
+    precision, since it feeds the PCA, regressions and risk engine as is."""
+    return {'df': df, 'validation': validate_data_quality(df, min_rows=min_rows)}
+
+def unpack_cached_frame(cached, min_rows: int = 100):
+    """(frame, validation) from a cache entry. Bare frames cached before the
+    validation was stored alongside are validated here instead."""
+    if isinstance(cached, dict) and 'df' in cached:
+        df = cached['df']
+        # Entries written while frames were cached as float32 come back as
+        # float64, the same dtypes as a fresh fetch
+        floats = df.select_dtypes('float32').columns
+        return df.astype({c: np.float64 for c in floats}), cached['validation']
+    return cached, validate_data_quality(cached, min_rows=min_rows)
+
+def _returns(prices: pd.DataFrame) -> pd.DataFrame:
+    """Daily % returns, dropping rows with a gap in any column; the same as
+    pct_change().dropna() * 100 in one pass over the prices."""
+    vals = prices.to_numpy(dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rets = (vals[1:] / vals[:-1] - 1.0) * 100.0
+    keep = ~np.isnan(rets).any(axis=1)
+    return pd.DataFrame(rets[keep], index=prices.index[1:][keep], columns=prices.columns)
+
+def _without_inf(df: pd.DataFrame) -> pd.DataFrame:
+    """df with ±inf turned into NaN, from one isinf pass over the values;
+    the frame comes back as is when there are none."""
+    vals = df.to_numpy(dtype=np.float64)
+    inf = np.isinf(vals)
+    if not inf.any():
+        return df
+    return pd.DataFrame(np.where(inf, np.nan, vals), index=df.index, columns=df.columns)
+
+async def _load_cached_frame(cache_key: str, min_rows: int = 100):
+    """(frame, validation) for a cached frame, or (None, None) on a miss."""
+    hit = _local_frames.get(cache_key)
+    if hit is None:
+        cached = await get_cached_data(cache_key)
+        if cached is None:
+            return None, None
+        hit = unpack_cached_frame(cached, min_rows=min_rows)
+        _local_frames.set(cache_key, hit)
+    df, validation = hit
+    # Shallow copy: callers adding or replacing columns leave the memo alone
+    return df.copy(deep=False), validation
+
+async def _has_valid_cache(cache_key: str, min_rows: int = 100) -> bool:
+    """Whether the cached frame under cache_key would be served as is. The
+    load is memoized, so the source reading it right after pays nothing."""
+    try:
+        _, validation = await _load_cached_frame(cache_key, min_rows=min_rows)
+    except Exception:
+        return False
+    return validation is not None and validation['is_valid']
+
+async def _fetch_fred_series(start_date: str, end_date: str, force_refresh: bool = False) -> Dict[str, pd.Series]:
+    """ECON_SERIES by name; series that fail or come back empty are left out."""
+    cache_key = "fred_macro"
+    if not force_refresh:
+        cached = await get_cached_data(cache_key)
+        if cached is not None:
+            logger.info("Loaded FRED series from cache")
+            return cached
+
+    # Each series is a blocking HTTP round-trip; run them side by side
+    async def _fetch_one(series_id):
+        return await asyncio.to_thread(fred.get_series, series_id, start=start_date, end=end_date)
+
+    results = await asyncio.gather(*map(_fetch_one, ECON_SERIES.values()), return_exceptions=True)
+
+    fred_data = {}
+    for (name, series_id), series_data in zip(ECON_SERIES.items(), results):
+        if isinstance(series_data, Exception):
+            logger.warning(f"Error fetching FRED series {series_id}: {series_data}")
+        elif not series_data.empty:
+            fred_data[name] = series_data
+            logger.debug(f"Successfully fetched FRED series: {name}")
+        else:
+            logger.warning(f"No data for FRED series: {series_id}")
+
+    logger.info(f"Successfully fetched {len(fred_data)}/{len(ECON_SERIES)} FRED series")
+    # Only a complete batch is kept, so one failed series isn't cached for a day
+    if len(fred_data) == len(ECON_SERIES):
+        await set_cached_data(cache_key, fred_data, expire_seconds=CACHE_TTL[cache_key])
+    return fred_data
+
+async def _download_prices(tickers, start_date: str = START_DATE) -> pd.DataFrame:
+    """Close prices for all tickers in one Yahoo request, off the event loop."""
+    end_date = datetime.now().strftime('%Y-%m-%d')
+    data = await asyncio.to_thread(yf.download, tickers, start=start_date, end=end_date, progress=False, auto_adjust=True)
+    return data['Close']
+
+def _slice_prices(prices: pd.DataFrame, tickers) -> pd.DataFrame:
+    """One group's columns from a combined download, on that group's own dates
+    (as if the group had been downloaded by itself)."""
+    return prices.reindex(columns=tickers).dropna(how='all')
+
+async def get_oil_data(force_refresh: bool = False, prices: Optional[pd.DataFrame] = None) -> pd.DataFrame:
     """Fetch oil price data (WTI crude) with caching."""
     cache_key = "oil_data"
     
     if not force_refresh:
         try:
-            cached_data = await get_cached_data(cache_key)
+            cached_data, validation = await _load_cached_frame(cache_key, min_rows=10)
             if cached_data is not None:
                 logger.info("Loaded oil data from cache")
-                validation = validate_data_quality(cached_data, min_rows=10)
                 if validation['is_valid']:
                     return cached_data
         except Exception as e:
@@ -93,20 +225,20 @@ async def get_oil_data(force_refresh: bool = False) -> pd.DataFrame:
     
     try:
         end_date = datetime.now().strftime('%Y-%m-%d')
-        start_date = '2003-01-01'
-        
-        logger.info(f"Downloading oil data from {start_date} to {end_date}")
+        start_date = START_DATE
         
         # WTI Crude Oil futures (CL=F) and US Oil Fund (USO) as fallback
-        oil_tickers = ['CL=F', 'USO', 'BZ=F']  # WTI, US Oil Fund, Brent
-        
-        oil_data = yf.download(oil_tickers, start=start_date, end=end_date, progress=False, auto_adjust=True)['Close']
+        if prices is not None:
+            oil_data = _slice_prices(prices, OIL_TICKERS)
+        else:
+            logger.info(f"Downloading oil data from {start_date} to {end_date}")
+            oil_data = await _download_prices(OIL_TICKERS, start_date)
         
         if oil_data.empty:
             logger.warning("No oil data from yfinance, trying FRED")
             # Fallback to FRED WTI crude price
             try:
-                wti_data = fred.get_series('DCOILWTICO', start=start_date, end=end_date)
+                wti_data = await asyncio.to_thread(fred.get_series, 'DCOILWTICO', start=start_date, end=end_date)
                 if not wti_data.empty:
                     oil_data = pd.DataFrame({'WTI': wti_data})
                     logger.info(f"Loaded WTI data from FRED: {len(oil_data)} rows")
@@ -117,7 +249,7 @@ async def get_oil_data(force_refresh: bool = False) -> pd.DataFrame:
                 raise
         
         # Calculate returns
-        oil_returns = oil_data.pct_change().dropna() * 100
+        oil_returns = _returns(oil_data)
         
         # Use the first available column as primary oil return
         if len(oil_returns.columns) > 0:
@@ -131,7 +263,8 @@ async def get_oil_data(force_refresh: bool = False) -> pd.DataFrame:
         
         # Cache results
         if not oil_df.empty:
-            await set_cached_data(cache_key, oil_df, expire_seconds=3600)
+            await set_cached_data(cache_key, _frame_entry(oil_df, min_rows=10), expire_seconds=CACHE_TTL[cache_key])
+            _local_frames.discard(cache_key)
             logger.info(f"Cached oil data with {len(oil_df)} rows")
         
         return oil_df
@@ -141,16 +274,15 @@ async def get_oil_data(force_refresh: bool = False) -> pd.DataFrame:
         # Return empty but properly formatted DataFrame
         return pd.DataFrame(columns=['oil_price', 'oil_return'])
 
-async def get_fx_data(force_refresh: bool = False) -> pd.DataFrame:
+async def get_fx_data(force_refresh: bool = False, prices: Optional[pd.DataFrame] = None) -> pd.DataFrame:
     """Fetch FX data (DXY and major currency pairs) with caching."""
     cache_key = "fx_data"
     
     if not force_refresh:
         try:
-            cached_data = await get_cached_data(cache_key)
+            cached_data, validation = await _load_cached_frame(cache_key, min_rows=10)
             if cached_data is not None:
                 logger.info("Loaded FX data from cache")
-                validation = validate_data_quality(cached_data, min_rows=10)
                 if validation['is_valid']:
                     return cached_data
         except Exception as e:
@@ -158,20 +290,19 @@ async def get_fx_data(force_refresh: bool = False) -> pd.DataFrame:
     
     try:
         end_date = datetime.now().strftime('%Y-%m-%d')
-        start_date = '2003-01-01'
-        
-        logger.info(f"Downloading FX data from {start_date} to {end_date}")
-        
-        # FX tickers: DXY (USD Index), EUR/USD, USD/JPY
-        fx_tickers = ['DX-Y.NYB', 'EURUSD=X', 'JPY=X', 'GBPUSD=X']  # DXY, EUR/USD, USD/JPY, GBP/USD
+        start_date = START_DATE
         
-        fx_data = yf.download(fx_tickers, start=start_date, end=end_date, progress=False, auto_adjust=True)['Close']
+        if prices is not None:
+            fx_data = _slice_prices(prices, FX_TICKERS)
+        else:
+            logger.info(f"Downloading FX data from {start_date} to {end_date}")
+            fx_data = await _download_prices(FX_TICKERS, start_date)
         
         if fx_data.empty:
             logger.warning("No FX data from yfinance, trying FRED")
             # Fallback to FRED DXY data
             try:
-                dxy_data = fred.get_series('DTWEXBGS', start=start_date, end=end_date)  # Broad Dollar Index
+                dxy_data = await asyncio.to_thread(fred.get_series, 'DTWEXBGS', start=start_date, end=end_date)  # Broad Dollar Index
                 if not dxy_data.empty:
                     fx_data = pd.DataFrame({'DXY': dxy_data})
                     logger.info(f"Loaded DXY data from FRED: {len(fx_data)} rows")
@@ -190,7 +321,7 @@ async def get_fx_data(force_refresh: bool = False) -> pd.DataFrame:
         })
         
         # Calculate returns (for DXY, positive return = USD strengthening)
-        fx_returns = fx_data.pct_change().dropna() * 100
+        fx_returns = _returns(fx_data)
         
         fx_df = pd.DataFrame()
         
@@ -213,7 +344,8 @@ async def get_fx_data(force_refresh: bool = False) -> pd.DataFrame:
         
         # Cache results
         if not fx_df.empty:
-            await set_cached_data(cache_key, fx_df, expire_seconds=3600)
+            await set_cached_data(cache_key, _frame_entry(fx_df, min_rows=10), expire_seconds=CACHE_TTL[cache_key])
+            _local_frames.discard(cache_key)
             logger.info(f"Cached FX data with {len(fx_df)} rows")
         
         return fx_df
@@ -223,8 +355,13 @@ async def get_fx_data(force_refresh: bool = False) -> pd.DataFrame:
         # Return empty but properly formatted DataFrame
         return pd.DataFrame(columns=['fx_change', 'dxy_return'])
 
-async def get_credit_signals(force_refresh: bool = False, _internal_call: bool = False) -> pd.DataFrame:
-    """Fetch credit signals with oil and FX data integration."""
+async def get_credit_signals(force_refresh: bool = False, _internal_call: bool = False, prices: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Fetch credit signals with oil and FX data integration.
+
+    prices: Close prices already downloaded by the caller (see
+    get_full_market_dataset); otherwise credit, oil and FX tickers are
+    fetched together here.
+    """
 
     if _internal_call:
         force_refresh = False 
@@ -234,10 +371,9 @@ async def get_credit_signals(force_refresh: bool = False, _internal_call: bool =
     # Try to get from cache first (unless force refresh)
     if not force_refresh:
         try:
-            cached_data = await get_cached_data(cache_key)
+            cached_data, validation = await _load_cached_frame(cache_key)
             if cached_data is not None:
                 logger.info("Loaded credit signals from cache")
-                validation = validate_data_quality(cached_data)
                 if validation['is_valid']:
                     return cached_data
                 else:
@@ -248,91 +384,80 @@ async def get_credit_signals(force_refresh: bool = False, _internal_call: bool =
     # Fetch fresh data
     try:
         end_date = datetime.now().strftime('%Y-%m-%d')
-        start_date = '2003-01-01'
+        start_date = START_DATE
         
-        logger.info(f"Downloading credit data from {start_date} to {end_date}")
-        etf_tickers = ['HYG', 'TLT', 'LQD', 'SPY']
-        etf_prices = yf.download(etf_tickers, start=start_date, end=end_date, progress=False, auto_adjust=True)['Close']
+        # FRED requests go out alongside the Yahoo download rather than after it
+        fred_task = asyncio.create_task(_fetch_fred_series(start_date, end_date, force_refresh))
+        if prices is None:
+            logger.info(f"Downloading credit, oil and FX data from {start_date} to {end_date}")
+            try:
+                prices = await _download_prices(CREDIT_TICKERS + OIL_TICKERS + FX_TICKERS, start_date)
+            except Exception:
+                fred_task.cancel()
+                raise
+        fred_data = await fred_task
+        etf_prices = _slice_prices(prices, CREDIT_TICKERS)
         
         if etf_prices.empty:
             raise ValueError("No ETF data downloaded")
             
         # Calculate credit ratio
         if 'HYG' in etf_prices.columns and 'TLT' in etf_prices.columns:
-            credit_ratio = np.log(etf_prices["HYG"] / etf_prices["TLT"])
-            credit_signal = (credit_ratio - credit_ratio.mean()) / credit_ratio.std()
-            credit_signal = credit_signal.rolling(20).mean()
-            credit_signal.name = 'credit_ratio_signal'
+            hyg = etf_prices["HYG"].to_numpy(dtype=np.float64, na_value=np.nan)
+            tlt = etf_prices["TLT"].to_numpy(dtype=np.float64, na_value=np.nan)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                credit_ratio = np.log(hyg / tlt)
+                z = (credit_ratio - np.nanmean(credit_ratio)) / np.nanstd(credit_ratio, ddof=1)
+            credit_signal = pd.Series(rolling_mean(z, 20), index=etf_prices.index, name='credit_ratio_signal')
         else:
             logger.warning("HYG or TLT not available for credit ratio")
             credit_signal = pd.Series(0, index=etf_prices.index, name='credit_ratio_signal')
 
         # Calculate returns
-        credit_returns = etf_prices.pct_change().dropna() * 100
+        credit_returns = _returns(etf_prices)
 
         logger.info(f"Downloaded {len(credit_returns)} rows of credit returns")
 
-        # Economic indicators with fallback
-        econ_series = {
-            'HY_Spread': 'BAMLH0A0HYM2',
-            'IG_Spread': 'BAMLC0A0CM', 
-            'VIX': 'VIXCLS',
-            'Unemployment': 'UNRATE',
-            'Term_Spread': 'T10Y2Y'
-        }
-        
-        fred_data = {}
-        successful_fred = 0
-        for name, series_id in econ_series.items():
-            try:
-                series_data = fred.get_series(series_id, start=start_date, end=end_date)
-                if not series_data.empty:
-                    fred_data[name] = series_data
-                    successful_fred += 1
-                    logger.debug(f"Successfully fetched FRED series: {name}")
-                else:
-                    logger.warning(f"No data for FRED series: {series_id}")
-            except Exception as e:
-                logger.warning(f"Error fetching FRED series {series_id}: {e}")
-        
-        logger.info(f"Successfully fetched {successful_fred}/{len(econ_series)} FRED series")
-        
-        all_data = credit_returns.copy()
+        # Output columns are collected here and the frame is built once at the
+        # end, on the credit returns' dates
+        columns = dict(credit_returns.items())
         
         # Add FRED data if available
         if fred_data:
-            fred_df = pd.DataFrame(fred_data)
+            # One outer-join alignment of all series; sort=True keeps the union
+            # index in date order, as pd.DataFrame(dict) did
+            fred_df = pd.concat(list(fred_data.values()), axis=1, keys=list(fred_data), sort=True)
             fred_daily = fred_df.reindex(credit_returns.index).ffill().dropna()
             if not fred_daily.empty:
                 fred_changes = fred_daily.pct_change() * 100
-                fred_changes.columns = [f"{col}_Change" for col in fred_changes.columns]
-                
-                all_data = pd.concat([all_data, fred_changes], axis=1)
+                for col, values in fred_changes.items():
+                    columns[f"{col}_Change"] = values
         
         # Fetch oil and FX data concurrently
-        oil_task = asyncio.create_task(get_oil_data(force_refresh))
-        fx_task = asyncio.create_task(get_fx_data(force_refresh))
+        oil_task = asyncio.create_task(get_oil_data(force_refresh, prices))
+        fx_task = asyncio.create_task(get_fx_data(force_refresh, prices))
         
         oil_data, fx_data = await asyncio.gather(oil_task, fx_task)
         
         # Merge oil data
         if not oil_data.empty:
-            oil_aligned = oil_data.reindex(all_data.index).ffill().dropna()
+            oil_aligned = oil_data.reindex(credit_returns.index).ffill().dropna()
             if not oil_aligned.empty:
-                all_data['oil_return'] = oil_aligned['oil_return']
-                all_data['oil_price'] = oil_aligned['oil_price']
+                columns['oil_return'] = oil_aligned['oil_return']
+                columns['oil_price'] = oil_aligned['oil_price']
                 logger.info(f"Added oil data: {len(oil_aligned)} rows")
         
         # Merge FX data  
         if not fx_data.empty:
-            fx_aligned = fx_data.reindex(all_data.index).ffill().dropna()
+            fx_aligned = fx_data.reindex(credit_returns.index).ffill().dropna()
             if not fx_aligned.empty:
-                all_data['fx_change'] = fx_aligned['fx_change']
+                columns['fx_change'] = fx_aligned['fx_change']
                 if 'dxy_return' in fx_aligned.columns:
-                    all_data['dxy_return'] = fx_aligned['dxy_return']
+                    columns['dxy_return'] = fx_aligned['dxy_return']
                 logger.info(f"Added FX data: {len(fx_aligned)} rows")
         
-        all_data = all_data.replace([np.inf, -np.inf], np.nan).ffill().dropna()
+        all_data = pd.DataFrame(columns, index=credit_returns.index)
+        all_data = _without_inf(all_data).ffill().dropna()
         
         # Final validation
         validation = validate_data_quality(all_data, min_rows=50)
@@ -340,7 +465,17 @@ async def get_credit_signals(force_refresh: bool = False, _internal_call: bool =
             logger.error(f"Credit signals validation failed: {validation['issues']}")
         
         if not all_data.empty:
-            await set_cached_data(cache_key, all_data, expire_seconds=3600)
+            # Summary goes to a sibling key in the same round-trip, so status
+            # checks never have to load the frame itself
+            await set_cached_many({
+                cache_key: _frame_entry(all_data),
+                f"{cache_key}:meta": {
+                    "rows": len(all_data),
+                    "columns": list(all_data.columns),
+                    "latest_date": str(all_data.index[-1]),
+                },
+            }, expire_seconds=CACHE_TTL[cache_key])
+            _local_frames.discard(cache_key)
 
         logger.info(f"Returning credit signals with {len(all_data)} rows and {len(all_data.columns)} columns")
         logger.info(f"Available columns: {list(all_data.columns)}")
@@ -350,7 +485,7 @@ async def get_credit_signals(force_refresh: bool = False, _internal_call: bool =
         logger.error(f"Critical error in get_credit_signals: {e}")
         # Try to return cached data even if it's stale
         try:
-            cached_data = await get_cached_data(cache_key)
+            cached_data, _ = await _load_cached_frame(cache_key)
             if cached_data is not None:
                 logger.warning("Returning stale cached data due to API failure")
                 return cached_data
@@ -360,16 +495,15 @@ async def get_credit_signals(force_refresh: bool = False, _internal_call: bool =
         logger.error("No data available - returning empty DataFrame")
         return pd.DataFrame()
 
-async def get_sector_data(force_refresh: bool = False) -> pd.DataFrame:
+async def get_sector_data(force_refresh: bool = False, prices: Optional[pd.DataFrame] = None) -> pd.DataFrame:
     """Downloads and caches daily returns for sector ETFs."""
     cache_key = "sector_data"
     
     if not force_refresh:
         try:
-            cached_data = await get_cached_data(cache_key)
+            cached_data, validation = await _load_cached_frame(cache_key)
             if cached_data is not None:
                 logger.info("Loaded sector data from cache")
-                validation = validate_data_quality(cached_data)
                 if validation['is_valid']:
                     return cached_data
                 else:
@@ -379,17 +513,18 @@ async def get_sector_data(force_refresh: bool = False) -> pd.DataFrame:
     
     try:
         end_date = datetime.now().strftime('%Y-%m-%d')
-        start_date = '2003-01-01'
+        start_date = START_DATE
         
-        sector_tickers = ["XLB", "XLE", "XLF", "XLI", "XLK", "XLP", "XLRE", "XLU", "XLV", "XLY", "SPY"]
-        
-        logger.info(f"Downloading sector data from {start_date} to {end_date}")
-        prices = yf.download(sector_tickers, start=start_date, end=end_date, progress=False, auto_adjust=True)["Close"]
+        if prices is not None:
+            prices = _slice_prices(prices, SECTOR_TICKERS)
+        else:
+            logger.info(f"Downloading sector data from {start_date} to {end_date}")
+            prices = await _download_prices(SECTOR_TICKERS, start_date)
         
         if prices.empty:
             raise ValueError("No sector data downloaded from Yahoo Finance")
             
-        rets = prices.pct_change().dropna() * 100
+        rets = _returns(prices)
         logger.info(f"Downloaded {len(rets)} rows of sector returns")
 
         validation = validate_data_quality(rets, min_rows=50)
@@ -397,14 +532,15 @@ async def get_sector_data(force_refresh: bool = False) -> pd.DataFrame:
             logger.error(f"Sector data validation failed: {validation['issues']}")
         
         if not rets.empty:
-            await set_cached_data(cache_key, rets, expire_seconds=3600)
+            await set_cached_data(cache_key, _frame_entry(rets), expire_seconds=CACHE_TTL[cache_key])
+            _local_frames.discard(cache_key)
 
         return rets
         
     except Exception as e:
         logger.error(f"Critical error in get_sector_data: {e}")
         try:
-            cached_data = await get_cached_data(cache_key)
+            cached_data, _ = await _load_cached_frame(cache_key)
             if cached_data is not None:
                 logger.warning("Returning stale cached sector data due to API failure")
                 return cached_data
@@ -424,10 +560,9 @@ async def get_full_market_dataset(force_refresh: bool = False, _internal_call: b
     
     if not force_refresh:
         try:
-            cached_data = await get_cached_data(cache_key)
+            cached_data, validation = await _load_cached_frame(cache_key)
             if cached_data is not None:
                 logger.info("Loaded full market dataset from cache")
-                validation = validate_data_quality(cached_data)
                 if validation['is_valid']:
                     return cached_data
                 else:
@@ -436,8 +571,20 @@ async def get_full_market_dataset(force_refresh: bool = False, _internal_call: b
             logger.warning(f"Error loading cached full dataset: {e}")
     
     try:
-        credit_task = asyncio.create_task(get_credit_signals(force_refresh))
-        sector_task = asyncio.create_task(get_sector_data(force_refresh))
+        # A source with a usable cache entry ignores prices, so only download
+        # when one of them is actually going to refetch. Then every ticker
+        # goes in one Yahoo request and each source slices its own columns;
+        # if that fails the sources fall back to downloading for themselves.
+        prices = None
+        if force_refresh or not all(await asyncio.gather(
+                _has_valid_cache("credit_signals"), _has_valid_cache("sector_data"))):
+            try:
+                prices = await _download_prices(ALL_TICKERS)
+            except Exception as e:
+                logger.warning(f"Combined price download failed: {e}")
+
+        credit_task = asyncio.create_task(get_credit_signals(force_refresh, prices=prices))
+        sector_task = asyncio.create_task(get_sector_data(force_refresh, prices))
 
         credit_data, sector_data = await asyncio.gather(credit_task, sector_task)
         
@@ -460,11 +607,13 @@ async def get_full_market_dataset(force_refresh: bool = False, _internal_call: b
         
         logger.info(f"Oil data available: {has_oil}, FX data available: {has_fx}")
         
-        overlapping_cols = set(sector_data.columns) & set(credit_data.columns)
-        if overlapping_cols:
-            logger.info(f"Found overlapping columns: {overlapping_cols}")
+        # Sector data wins for tickers in both (SPY); the credit copy is left
+        # out of the join rather than joined with a suffix and dropped after
+        overlapping_cols = sector_data.columns.intersection(credit_data.columns)
+        if len(overlapping_cols):
+            logger.info(f"Found overlapping columns: {set(overlapping_cols)}")
         
-        merged = sector_data.join(credit_data, how="outer", rsuffix="_credit")
+        merged = sector_data.join(credit_data.drop(columns=overlapping_cols), how="outer")
         
         logger.info(f"After outer join (before ffill): {len(merged)} rows")
         
@@ -472,12 +621,6 @@ async def get_full_market_dataset(force_refresh: bool = False, _internal_call: b
         
         logger.info(f"After ffill + dropna: {len(merged)} rows")
         
-        # Remove columns with suffix
-        suffix_cols = [col for col in merged.columns if col.endswith('_credit')]
-        if suffix_cols:
-            logger.info(f"Dropping suffixed columns: {suffix_cols}")
-            merged = merged.drop(columns=suffix_cols)
-        
         validation = validate_data_quality(merged)
         if not validation['is_valid']:
             logger.warning(f"Merged dataset has issues: {validation['issues']}")
@@ -487,11 +630,15 @@ async def get_full_market_dataset(force_refresh: bool = False, _internal_call: b
             return pd.DataFrame()
 
         if not merged.empty:
-            merged = merged.replace([np.inf, -np.inf], np.nan)
-            merged = merged.bfill()
-            merged = merged.ffill()
-            merged = merged.fillna(0)
-            await set_cached_data(cache_key, merged, expire_seconds=3600)
+            # One finiteness scan; the fills (inf -> NaN, bfill, ffill, then 0)
+            # only run when there is something left to fill
+            vals = merged.to_numpy(dtype=np.float64)
+            bad = ~np.isfinite(vals)
+            if bad.any():
+                vals = np.where(bad, np.nan, vals)
+                merged = pd.DataFrame(vals, index=merged.index, columns=merged.columns).bfill().ffill().fillna(0)
+            await set_cached_data(cache_key, _frame_entry(merged), expire_seconds=CACHE_TTL[cache_key])
+            _local_frames.discard(cache_key)
 
         logger.info(f"Returning full market dataset with {len(merged)} rows and {len(merged.columns)} columns")
         logger.info(f"Final columns: {list(merged.columns)}")
@@ -500,7 +647,7 @@ async def get_full_market_dataset(force_refresh: bool = False, _internal_call: b
     except Exception as e:
         logger.error(f"Error in get_full_market_dataset: {e}")
         try:
-            cached_data = await get_cached_data(cache_key)
+            cached_data, _ = await _load_cached_frame(cache_key)
             if cached_data is not None:
                 logger.warning("Returning stale cached full dataset due to merge failure")
                 return cached_data
@@ -525,18 +672,20 @@ async def debug_signal_generation():
             spy_returns = full_df['SPY'].pct_change().dropna()
             print(f"SPY returns available: {len(spy_returns)}")
             
-            # Test HAR calculation
-            realized_vol = spy_returns.rolling(window=21).std()
-            daily_vol = spy_returns.rolling(window=1).std()
-            weekly_vol = spy_returns.rolling(window=5).std()
-            monthly_vol = spy_returns.rolling(window=21).std()
+            # Test HAR calculation, as the analytics router computes it: a
+            # 1-day rolling std is always NaN, so the forecast averages the
+            # weekly and monthly components (the monthly doubles as realized)
+            spy = spy_returns.to_numpy(dtype=np.float64)
+            weekly_vol = rolling_std(spy, 5)
+            monthly_vol = rolling_std(spy, 21)
+            realized_vol = monthly_vol
             
-            har_forecast = (daily_vol + weekly_vol + monthly_vol) / 3
+            har_forecast = (weekly_vol + monthly_vol) / 2
             excess_vol = realized_vol - har_forecast
             
-            if not excess_vol.dropna().empty:
-                har_z = (excess_vol - excess_vol.mean()) / excess_vol.std()
-                print(f"HAR excess vol z-score latest: {har_z.iloc[-1]}")
+            if not np.isnan(excess_vol).all():
+                har_z = (excess_vol - np.nanmean(excess_vol)) / np.nanstd(excess_vol, ddof=1)
+                print(f"HAR excess vol z-score latest: {har_z[-1]}")
             else:
                 print("HAR calculation failed - no excess vol data")
         
@@ -547,8 +696,8 @@ async def debug_signal_generation():
             
             common_idx = xlk_returns.index.intersection(xlf_returns.index)
             if len(common_idx) > 0:
-                rolling_corr = xlk_returns.rolling(window=21).corr(xlf_returns)
-                print(f"DCC correlation latest: {rolling_corr.iloc[-1]}")
+                corr = rolling_corr(xlk_returns.to_numpy(), xlf_returns.reindex(xlk_returns.index).to_numpy(), 21)
+                print(f"DCC correlation latest: {corr[-1]}")
             else:
                 print("DCC calculation failed - no common dates")
                 
@@ -1,3 +1,4 @@
+import inspect
 import time
 import logging
 from functools import wraps
@@ -7,35 +8,39 @@ logger = logging.getLogger(__name__)
 
 def log_execution(func: Callable) -> Callable:
     """Log execution time of function."""
+    name = func.__name__
+
     @wraps(func)
     async def async_wrapper(*args, **kwargs) -> Any:
-        start = time.time()
-        logger.info(f"[START] {func.__name__}")
+        start = time.perf_counter()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"[START] {name}")
         try:
             result = await func(*args, **kwargs)
-            duration = time.time() - start
-            logger.info(f"[SUCCESS] {func.__name__} completed in {duration:.2f}s")
-            return result
         except Exception as e:
-            duration = time.time() - start
-            logger.error(f"[ERROR] {func.__name__} failed after {duration:.2f}s: {e}")
+            logger.error(f"[ERROR] {name} failed after {time.perf_counter() - start:.2f}s: {e}")
             raise
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"[SUCCESS] {name} completed in {time.perf_counter() - start:.2f}s")
+        return result
     
     @wraps(func)
     def sync_wrapper(*args, **kwargs) -> Any:
-        start = time.time()
-        logger.info(f"[START] {func.__name__}")
+        start = time.perf_counter()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"[START] {name}")
         try:
             result = func(*args, **kwargs)
-            duration = time.time() - start
-            logger.info(f"[SUCCESS] {func.__name__} completed in {duration:.2f}s")
-            return result
         except Exception as e:
-            duration = time.time() - start
-            logger.error(f"[ERROR] {func.__name__} failed after {duration:.2f}s: {e}")
+            logger.error(f"[ERROR] {name} failed after {time.perf_counter() - start:.2f}s: {e}")
             raise
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"[SUCCESS] {name} completed in {time.perf_counter() - start:.2f}s")
+        return result
     
-    return async_wrapper if hasattr(func, '__await__') else sync_wrapper
+    # Coroutine functions need the awaiting wrapper; checking the function for
+    # __await__ never matches, since only the coroutine it returns has one
+    return async_wrapper if inspect.iscoroutinefunction(func) else sync_wrapper
 
 def safe_execute(func: Callable) -> Callable:
     """Safely execute function with error handling."""
@@ -55,4 +60,4 @@ def safe_execute(func: Callable) -> Callable:
             logger.error(f"[SAFE_EXECUTE] {func.__name__} failed: {e}")
             return {"error": str(e), "function": func.__name__}
     
-    return async_wrapper if hasattr(func, '__await__') else sync_wrapper
\ No newline at end of file
+    return async_wrapper if inspect.iscoroutinefunction(func) else sync_wrapper
@@ -1,6 +1,25 @@
+import numpy as np
+import pywt
+
 from .base_filter import BaseFilter
 
 class WaveletFilter(BaseFilter):
+    """Wavelet shrinkage denoising: detail coefficients are thresholded at the
+    universal threshold, with the noise level estimated from the finest level."""
+
+    def __init__(self, wavelet: str = 'db4', level=None, mode: str = 'soft'):
+        self.wavelet = wavelet
+        self.level = level
+        self.mode = mode
+
     def apply(self, signal):
-        print("Applying Wavelet filter...")
-        return [s * 0.8 for s in signal]
+        x = np.asarray(signal, dtype=np.float64)
+        if x.size < 2:
+            return x.copy()
+
+        coeffs = pywt.wavedec(x, self.wavelet, level=self.level)
+        sigma = np.median(np.abs(coeffs[-1])) / 0.6745
+        value = sigma * np.sqrt(2 * np.log(x.size))
+        coeffs[1:] = [pywt.threshold(c, value, mode=self.mode) for c in coeffs[1:]]
+        # waverec pads odd lengths by one sample
+        return pywt.waverec(coeffs, self.wavelet)[:x.size]
@@ -8,49 +8,125 @@ from app.services.risk_engine import RiskEngine
 
 logger = logging.getLogger(__name__)
 
+# Keys copied from RiskEngine metrics into current_risk_metrics, with the
+# value used when a key is missing. The empty containers are shared by every
+# snapshot, so they must not be mutated.
+_METRIC_SCHEMA = (
+    # Core systemic metrics
+    ("systemic_risk", 0.0),
+    ("systemic_mean", 0.0),
+    ("systemic_std", 1.0),
+    ("risk_level", "unknown"),
+    # Risk regime details
+    ("regime_details", {}),
+    # DCC-specific metrics
+    ("dcc_correlation", None),
+    ("dcc_regime_analysis", {}),
+    ("dcc_pair_correlations", {}),
+    # All risk signals
+    ("quantile_signal", None),
+    ("har_excess_vol", None),
+    ("credit_spread_change", None),
+    ("vix_change", None),
+    ("composite_warning", None),
+    ("composite_risk_score", None),
+    # Signal analysis metadata
+    ("signal_analysis", {}),
+    ("component_analysis", {}),
+    ("credit_spread", None),
+    ("market_volatility", None),
+    ("macro_oil", None),
+    ("macro_fx", None),
+    ("forecast_next_risk", None),
+    # PCA and quantile data
+    ("pca_variance", {}),
+    ("quantile_summary", {}),
+    ("pca_metadata", {}),
+    # Computation metadata
+    ("data_points", 0),
+    ("available_signals", []),
+    ("computation_time", None),
+    ("source", "risk_engine"),
+    ("computation_duration", 0.0),
+    ("date_range", {}),
+)
+
+# Nested fields get_websocket_metrics forwards. The compact stream carries
+# the headline numbers only; correlation matrices and the DCC regime
+# breakdown stay in the full metrics.
+_WS_COMPONENT_FIELDS = (
+    "pca_contribution", "credit_contribution",
+    "pca_volatility", "credit_volatility",
+    "pca_trend", "credit_trend",
+    "current_pca", "current_credit",
+    "dcc_correlation", "dcc_regime", "dcc_stress_contrast",
+)
+_WS_REGIME_FIELDS = ("regime_score", "component_z_scores", "component_contributions", "thresholds")
+
+
+def _pick(source: dict, fields) -> dict:
+    return {key: source[key] for key in fields if key in source}
+
 class RealtimeRiskService:
     def __init__(self):
         self.current_risk_metrics = {}
+        # Monotonic (event loop clock) time of the last successful computation
         self.last_computation_time = None
         self.computation_interval = 300  # 5 minutes
-        self.is_computing = False
-        self._computation_lock = asyncio.Lock()
+        # The running computation, if any; every caller that finds the
+        # metrics stale meanwhile awaits this same task
+        self._inflight = None
+        self._compute_wait_timeout = 120
         self._last_metrics_cache = None
         self._cache_timeout = 30  # 30 seconds for quick cache
         
     async def get_current_metrics(self):
         """Get current risk metrics with proper caching and locking."""
-        current_time = datetime.utcnow()
+        # Freshness is measured on the loop's monotonic clock: a float
+        # subtraction, and immune to wall-clock jumps
+        loop = asyncio.get_running_loop()
+        now = loop.time()
         
         # Check quick cache (30 seconds)
-        if (self._last_metrics_cache and 
-            (current_time - self._last_metrics_cache.get('timestamp', datetime.min)).total_seconds() < self._cache_timeout):
+        cache = self._last_metrics_cache
+        if cache is not None and now - cache['timestamp'] < self._cache_timeout:
             logger.debug("Returning cached metrics (30s cache)")
-            return self._last_metrics_cache['metrics']
+            return cache['metrics']
         
         # Check main computation cache (5 minutes)
-        if (self.last_computation_time and 
-            (current_time - self.last_computation_time).total_seconds() < self.computation_interval and
+        if (self.last_computation_time is not None and 
+            now - self.last_computation_time < self.computation_interval and
             self.current_risk_metrics):
             logger.debug("Returning cached risk metrics (5min cache)")
             self._last_metrics_cache = {
-                'timestamp': current_time,
+                'timestamp': now,
                 'metrics': self.current_risk_metrics
             }
             return self.current_risk_metrics
         
-        # Compute new metrics if needed
-        async with self._computation_lock:
-            if (self.last_computation_time and 
-                (current_time - self.last_computation_time).total_seconds() < self.computation_interval):
-                return self.current_risk_metrics
-                
-            if not self.is_computing:
-                await self._compute_risk_metrics()
+        # Stale: join the running computation, or start one
+        task = self._inflight
+        if task is None:
+            task = self._inflight = loop.create_task(self._refresh_metrics())
+        try:
+            # Shielded so a caller timing out or disconnecting does not
+            # cancel the computation the others are waiting on
+            return await asyncio.wait_for(asyncio.shield(task), timeout=self._compute_wait_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Risk metrics computation still running - returning last metrics")
+            return self.current_risk_metrics
+    
+    async def _refresh_metrics(self):
+        """Run one computation and publish it to the quick cache."""
+        started = asyncio.get_running_loop().time()
+        try:
+            await self._compute_risk_metrics()
+        finally:
+            self._inflight = None
         
         # Update quick cache
         self._last_metrics_cache = {
-            'timestamp': current_time,
+            'timestamp': started,
             'metrics': self.current_risk_metrics
         }
         
@@ -58,7 +134,6 @@ class RealtimeRiskService:
     
     async def _compute_risk_metrics(self):
         """Compute risk metrics using RiskEngine's compute_full_risk method."""
-        self.is_computing = True
         try:
             logger.info("Computing real-time risk metrics using RiskEngine...")
 
@@ -67,56 +142,13 @@ class RealtimeRiskService:
             
             metrics = full_result.get("metrics", {})
             
+            now = datetime.utcnow().isoformat() + "Z"
             self.current_risk_metrics = {
-                "timestamp": metrics.get("timestamp", datetime.utcnow().isoformat() + "Z"),
-                
-                # Core systemic metrics
-                "systemic_risk": metrics.get("systemic_risk", 0.0),
-                "systemic_mean": metrics.get("systemic_mean", 0.0),
-                "systemic_std": metrics.get("systemic_std", 1.0),
-                "risk_level": metrics.get("risk_level", "unknown"),
-                
-                # Risk regime details
-                "regime_details": metrics.get("regime_details", {}),
-                
-                # DCC-specific metrics
-                "dcc_correlation": metrics.get("dcc_correlation"),
-                "dcc_regime_analysis": metrics.get("dcc_regime_analysis", {}),
-                "dcc_pair_correlations": metrics.get("dcc_pair_correlations", {}),
-                
-                # All risk signals
-                "quantile_signal": metrics.get("quantile_signal"),
-                "har_excess_vol": metrics.get("har_excess_vol"),
-                "credit_spread_change": metrics.get("credit_spread_change"),
-                "vix_change": metrics.get("vix_change"),
-                "composite_warning": metrics.get("composite_warning"),
-                "composite_risk_score": metrics.get("composite_risk_score"),
-                
-                # Signal analysis metadata
-                "signal_analysis": metrics.get("signal_analysis", {}),
-                "component_analysis": metrics.get("component_analysis", {}),
-            
-                "credit_spread": metrics.get("credit_spread"),
-                "market_volatility": metrics.get("market_volatility"),
-                "macro_oil": metrics.get("macro_oil"),
-                "macro_fx": metrics.get("macro_fx"),
-                "forecast_next_risk": metrics.get("forecast_next_risk"),
-                
-                # PCA and quantile data
-                "pca_variance": metrics.get("pca_variance", {}),
-                "quantile_summary": metrics.get("quantile_summary", {}),
-                "pca_metadata": metrics.get("pca_metadata", {}),
-                
-                # Computation metadata
-                "data_points": metrics.get("data_points", 0),
-                "available_signals": metrics.get("available_signals", []),
-                "computation_time": metrics.get("computation_time"),
-                "source": metrics.get("source", "risk_engine"),
-                "computation_duration": metrics.get("computation_duration", 0.0),
-                "date_range": metrics.get("date_range", {})
+                "timestamp": metrics["timestamp"] if "timestamp" in metrics else now,
+                **{key: metrics.get(key, default) for key, default in _METRIC_SCHEMA},
             }
 
-            self.last_computation_time = datetime.utcnow()
+            self.last_computation_time = asyncio.get_running_loop().time()
             logger.info("Real-time risk metrics updated from RiskEngine with comprehensive data")
 
         except Exception as e:
@@ -131,8 +163,6 @@ class RealtimeRiskService:
             except Exception as cache_error:
                 logger.error(f"Cache fallback also failed: {cache_error}")
                 self.current_risk_metrics = self._get_fallback_metrics()
-        finally:
-            self.is_computing = False
 
     async def get_websocket_metrics(self):
         """Get optimized metrics for WebSocket broadcasting."""
@@ -152,8 +182,8 @@ class RealtimeRiskService:
                 "har_vol": full_metrics.get("har_excess_vol"),
                 "vix_change": full_metrics.get("vix_change")
             },
-            "components": full_metrics.get("component_analysis", {}),
-            "regime": full_metrics.get("regime_details", {})
+            "components": _pick(full_metrics.get("component_analysis") or {}, _WS_COMPONENT_FIELDS),
+            "regime": _pick(full_metrics.get("regime_details") or {}, _WS_REGIME_FIELDS)
         }
 
     async def get_comprehensive_metrics(self):
@@ -164,6 +194,10 @@ class RealtimeRiskService:
         """Get cached market data if available."""
         try:
             market_data = await get_cached_data("market_data_latest")
+            # Frames come back from the pickle-5 cache with their column
+            # buffers intact; only older row-wise payloads need rebuilding
+            if isinstance(market_data, pd.DataFrame):
+                return market_data
             if market_data:
                 return pd.DataFrame(market_data)
         except Exception as e:
@@ -179,9 +213,13 @@ class RealtimeRiskService:
     async def _get_market_volatility(self, market_data):
         """Calculate market volatility from cached data."""
         if not market_data.empty and "SPY" in market_data.columns:
-            spy_returns = market_data["SPY"].pct_change().dropna()
+            # Only the last 20-day window is needed, so take its std directly
+            # rather than building the full rolling series
+            spy = market_data["SPY"].to_numpy(dtype=np.float64)
+            spy_returns = spy[1:] / spy[:-1] - 1.0
+            spy_returns = spy_returns[~np.isnan(spy_returns)]
             if len(spy_returns) > 20:
-                return float(spy_returns.rolling(20).std().iloc[-1] * 100)
+                return float(spy_returns[-20:].std(ddof=1) * 100)
         return 20.0
     
     def _get_fallback_metrics(self):
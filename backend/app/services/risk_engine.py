@@ -15,10 +15,11 @@ from app.services.systemic_risk import compute_systemic_risk
 from app.services.strategies.dcc_garch_strategy import RegimeSwitchingDCC, compute_quantile_regression
 from app.core.db_utils import save_systemic_snapshot, save_quantile_results, save_risk_snapshot
 from app.core.cache import (
-    get_cached_full_risk, cache_full_risk,
-    get_cached_systemic_snapshot, cache_systemic_snapshot,
+    get_cached_full_risk,
+    get_cached_systemic_snapshot,
     get_cached_quantile_snapshot, cache_quantile_snapshot,
-    get_cached_data, set_cached_data
+    get_cached_data, set_cached_data, set_cached_many,
+    RISK_CACHE_KEY, SYSTEMIC_CACHE_KEY
 )
 from app.services.decorators import log_execution, safe_execute
 import logging
@@ -60,14 +61,15 @@ class RiskEngine:
     async def cache_risk_computation(self, result: Dict[str, Any]):
         """Cache risk computation results"""
         try:
-            await cache_full_risk(result["metrics"], self._cache_ttl)
+            items = {RISK_CACHE_KEY: result["metrics"]}
             
             if "systemic_df" in result and result["systemic_df"] is not None:
-                systemic_data = {
+                items[SYSTEMIC_CACHE_KEY] = {
                     "data": result["systemic_df"].to_dict(),
                     "timestamp": datetime.utcnow().isoformat()
                 }
-                await cache_systemic_snapshot(systemic_data, self._cache_ttl)
+            # Both snapshots go out in one pipelined round-trip
+            await set_cached_many(items, self._cache_ttl)
             
             logger.info("Risk computation cached successfully")
         except Exception as e:
@@ -76,8 +78,9 @@ class RiskEngine:
     # -----------------------------
     # Process signal
     # -----------------------------
+    # No safe_execute here: callers rely on the exception to reach their
+    # cached fallbacks
     @log_execution
-    @safe_execute
     async def compute_full_risk(self, force_refresh: bool = False, days: int = None, start_date: str = None, end_date: str = None) -> Dict[str, Any]:
         """
         Enhanced end-to-end risk computation using ALL systemic risk signals